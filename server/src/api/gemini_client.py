@@ -1,10 +1,14 @@
 """Gemini API client for LLM operations."""
 
+import hashlib
 import json
+import threading
 import time
+from datetime import timedelta
 from typing import Any
 
 import google.generativeai as genai
+from google.generativeai import caching
 from google.generativeai.types import GenerationConfig
 from json_repair import repair_json
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -22,12 +26,88 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Bump whenever the schema extraction prompt changes so cached extractions are not reused
+SCHEMA_PROMPT_VERSION = "2"
+# Same for the data generation prompt and cached chunk rows
+DATA_PROMPT_VERSION = "3"
+
+# Used unique values are summarized in the prompt, not listed in full: the model sees how
+# many exist plus the most recent few, so prompt size stays flat as a job grows
+EXISTING_VALUES_PROMPT_SAMPLE = 20
+EXISTING_VALUE_PROMPT_MAX_CHARS = 80
+
 try:
     from langfuse import Langfuse  # type: ignore[import-not-found]
 except ImportError:  # pragma: no cover - optional dependency
     Langfuse = None
 
 
+def summarize_existing_values(existing_values: dict[str, list[Any]]) -> dict[str, dict[str, Any]]:
+    """Summarize used unique values as a bounded do-not-reuse hint for the prompt.
+
+    Args:
+        existing_values: All values used so far per unique field, oldest first
+
+    Returns:
+        Per field, the number of used values and up to EXISTING_VALUES_PROMPT_SAMPLE
+        of the most recent ones, long or nested values truncated
+    """
+    summary = {}
+    for field, values in existing_values.items():
+        recent = []
+        for value in values[-EXISTING_VALUES_PROMPT_SAMPLE:]:
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, default=str)
+            if isinstance(value, str) and len(value) > EXISTING_VALUE_PROMPT_MAX_CHARS:
+                value = value[:EXISTING_VALUE_PROMPT_MAX_CHARS] + "..."
+            recent.append(value)
+        summary[field] = {"used": len(values), "recent": recent}
+    return summary
+
+
+class TokenBucket:
+    """Thread-safe token bucket that blocks callers until capacity is available."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """Initialize token bucket.
+
+        Args:
+            capacity: Maximum tokens the bucket holds (the allowed burst)
+            refill_per_second: Tokens added back per second
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: float = 1) -> float:
+        """Take tokens from the bucket, sleeping until enough have refilled.
+
+        Args:
+            cost: Tokens to take; capped at capacity so one request can always pass
+
+        Returns:
+            Seconds spent waiting
+        """
+        cost = min(cost, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.refill_per_second
+                )
+                self._updated = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return waited
+                wait = (cost - self._tokens) / self.refill_per_second
+            time.sleep(wait)
+            waited += wait
+
+
 class GeminiClient:
     """Client for interacting with Google Gemini API."""
 
@@ -44,29 +124,32 @@ class GeminiClient:
         self.max_retries = settings.gemini_max_retries
         self.timeout = settings.gemini_timeout
 
-        # Rate limiting
+        # Rate limiting: throttle before calling rather than waiting for quota errors
         self.requests_per_minute = settings.rate_limit_requests_per_minute
         self.tokens_per_minute = settings.rate_limit_tokens_per_minute
-        self.request_times: list[float] = []
+        self._request_bucket = TokenBucket(self.requests_per_minute, self.requests_per_minute / 60)
+        self._token_bucket = TokenBucket(self.tokens_per_minute, self.tokens_per_minute / 60)
+
+        # Gemini context caches for stable prompt prefixes: prefix hash -> (cache, expiry).
+        # The CachedContent object is kept so using it needs no CachedContent.get round trip.
+        self._context_caches: dict[str, tuple[caching.CachedContent, float]] = {}
+        self._context_cache_lock = threading.Lock()
 
         self._langfuse_client = self._init_langfuse()
 
         logger.info(f"Initialized Gemini client with model: {self.model_name}")
 
-    def _check_rate_limit(self):
-        """Check and enforce rate limiting."""
-        current_time = time.time()
-        # Remove requests older than 1 minute
-        self.request_times = [t for t in self.request_times if current_time - t < 60]
-
-        if len(self.request_times) >= self.requests_per_minute:
-            sleep_time = 60 - (current_time - self.request_times[0])
-            if sleep_time > 0:
-                logger.warning(f"Rate limit reached, sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-                self.request_times = []
-
-        self.request_times.append(current_time)
+    def _check_rate_limit(self, prompt: str):
+        """Wait until both the request and token quotas allow sending the prompt."""
+        # Roughly four characters per token; only the prompt is known up front
+        estimated_tokens = len(prompt) // 4 + 1
+        waited = self._request_bucket.acquire()
+        waited += self._token_bucket.acquire(estimated_tokens)
+        if waited > 0:
+            logger.warning(
+                f"Rate limit reached, waited {waited:.2f} seconds "
+                f"(~{estimated_tokens} prompt tokens)"
+            )
 
     def _init_langfuse(self):
         """Initialise Langfuse telemetry client if configured."""
@@ -123,23 +206,69 @@ class GeminiClient:
             logger.warning(f"Unable to start Langfuse trace '{name}': {exc}")
             return None
 
+    def _get_context_cache(self, prefix: str) -> tuple[str, caching.CachedContent] | None:
+        """Get a Gemini context cache holding the prompt prefix.
+
+        The cache is created on first use and recreated once its TTL lapses.
+        Returns None when caching is disabled, the prefix is too short to be
+        eligible, or the cache cannot be created.
+
+        Returns:
+            Tuple of (cache key, CachedContent), or None to send the full prompt
+        """
+        config = settings.gemini
+        if not config.context_cache_enabled or len(prefix) // 4 < config.context_cache_min_tokens:
+            return None
+
+        key = hashlib.sha256(f"{self.model_name}\0{prefix}".encode()).hexdigest()
+        with self._context_cache_lock:
+            cached = self._context_caches.get(key)
+        if cached and cached[1] > time.monotonic():
+            return key, cached[0]
+
+        # Created outside the lock so a slow create() never blocks requests for other prefixes;
+        # threads racing on the same prefix may each create one and the last one is kept
+        try:
+            cache = caching.CachedContent.create(
+                model=self.model_name,
+                contents=[prefix],
+                ttl=timedelta(seconds=config.context_cache_ttl)
+            )
+        except Exception as e:
+            logger.warning(f"Unable to create Gemini context cache, sending full prompt: {e}")
+            return None
+
+        # Refresh early so requests never reference an expired cache
+        refresh_margin = min(60, config.context_cache_ttl // 10)
+        expires_at = time.monotonic() + config.context_cache_ttl - refresh_margin
+        with self._context_cache_lock:
+            self._context_caches[key] = (cache, expires_at)
+        logger.info(f"Created Gemini context cache {cache.name}")
+        return key, cache
+
+    def _evict_context_cache(self, key: str):
+        """Forget a context cache the API no longer accepts."""
+        with self._context_cache_lock:
+            self._context_caches.pop(key, None)
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10)
     )
-    def _generate_content(self, prompt: str, **kwargs) -> str:
+    def _generate_content(self, prompt: str, prefix: str = "", **kwargs) -> str:
         """Generate content with retry logic.
         
         Args:
             prompt: The prompt to send to the model
+            prefix: Stable start of the prompt, served from a context cache when possible
             **kwargs: Additional generation parameters
             
         Returns:
             Generated text content
         """
-        self._check_rate_limit()
+        self._check_rate_limit(prefix + prompt)
 
-        model = genai.GenerativeModel(self.model_name)
+        context_cache = self._get_context_cache(prefix) if prefix else None
 
         generation_config = GenerationConfig(
             temperature=kwargs.get("temperature", 0.7),
@@ -148,6 +277,30 @@ class GeminiClient:
             max_output_tokens=kwargs.get("max_output_tokens", 8192),
         )
 
+        if context_cache:
+            cache_key, cache = context_cache
+            model = genai.GenerativeModel.from_cached_content(cached_content=cache)
+            try:
+                return self._send_prompt(model, prompt, generation_config)
+            except Exception as e:
+                # The server-side cache may have been deleted or expired early; drop it and
+                # send the full prompt now rather than failing every retry on the same cache
+                logger.warning(
+                    f"Request with Gemini context cache {cache.name} failed, "
+                    f"retrying with the full prompt: {e}"
+                )
+                self._evict_context_cache(cache_key)
+
+        model = genai.GenerativeModel(self.model_name)
+        return self._send_prompt(model, prefix + prompt, generation_config)
+
+    def _send_prompt(
+        self,
+        model: genai.GenerativeModel,
+        prompt: str,
+        generation_config: GenerationConfig
+    ) -> str:
+        """Send a prompt and return the response text."""
         try:
             response = model.generate_content(
                 prompt,
@@ -306,7 +459,8 @@ class GeminiClient:
         """
         logger.info(f"Generating {num_rows} rows of data")
 
-        prompt = self._build_data_generation_prompt(schema, num_rows, existing_values, seed)
+        prefix, suffix = self._build_data_generation_prompt(schema, num_rows, existing_values, seed)
+        prompt = prefix + suffix
         trace = self._start_trace(
             name="gemini.generate_data_chunk",
             inputs={
@@ -324,7 +478,7 @@ class GeminiClient:
 
         # Parse JSON response
         try:
-            response_text = self._generate_content(prompt, temperature=0.8)
+            response_text = self._generate_content(suffix, prefix=prefix, temperature=0.8)
 
             # Extract JSON from markdown code blocks if present
             if "```json" in response_text:
@@ -384,19 +538,10 @@ class GeminiClient:
 
     def _build_schema_extraction_prompt(self, request: SchemaExtractionRequest) -> str:
         """Build prompt for schema extraction."""
-        prompt = f"""You are an expert data engineer. Extract a structured data schema from the following user request.
-
-User Request: {request.user_input}
-
-"""
-
-        if request.context:
-            prompt += f"\nAdditional Context: {json.dumps(request.context, indent=2)}\n"
-
-        if request.example_data:
-            prompt += f"\nExample Data: {request.example_data}\n"
+        # Static instructions come first so provider-side prompt caching can reuse the prefix
+        prompt = """You are an expert data engineer. \
+Extract a structured data schema from the user request at the end of this prompt.
 
-        prompt += """
 Please analyze the request and generate a JSON schema with the following structure:
 
 {
@@ -441,6 +586,15 @@ Important:
 
 Return ONLY the JSON schema, no additional text.
 """
+
+        prompt += f"\nUser Request: {request.user_input}\n"
+
+        if request.context:
+            prompt += f"\nAdditional Context: {json.dumps(request.context, indent=2)}\n"
+
+        if request.example_data:
+            prompt += f"\nExample Data: {request.example_data}\n"
+
         return prompt
 
     def _build_data_generation_prompt(
@@ -449,8 +603,8 @@ Return ONLY the JSON schema, no additional text.
         num_rows: int,
         existing_values: dict[str, list[Any]] | None,
         seed: int | None
-    ) -> str:
-        """Build prompt for data generation."""
+    ) -> tuple[str, str]:
+        """Build prompt for data generation as a (stable prefix, per-chunk suffix) pair."""
         schema_json = {
             "description": schema.description,
             "fields": [
@@ -477,22 +631,16 @@ Return ONLY the JSON schema, no additional text.
             ]
         }
 
-        prompt = f"""You are a synthetic data generator. Generate {num_rows} rows of realistic data following this schema:
+        # Schema and instructions are identical for every chunk of a job, so they form a
+        # stable prefix for provider-side prompt caching; per-chunk values go last
+        prefix = f"""You are a synthetic data generator. \
+Generate realistic data following this schema:
 
 Schema:
 {json.dumps(schema_json, indent=2)}
 
-"""
-
-        if existing_values:
-            prompt += f"\nExisting Values (avoid duplicates for unique fields):\n{json.dumps(existing_values, indent=2)}\n"
-
-        if seed:
-            prompt += f"\nRandom Seed: {seed}\n"
-
-        prompt += f"""
 Requirements:
-- Generate EXACTLY {num_rows} rows
+- Generate EXACTLY the number of rows requested at the end of this prompt
 - Follow all field types and constraints strictly
 - Ensure unique values for fields marked as unique
 - Generate realistic, coherent data
@@ -508,7 +656,20 @@ Example output format:
 
 Return ONLY the JSON array, no additional text or explanations.
 """
-        return prompt
+
+        suffix = ""
+        if existing_values:
+            summary = json.dumps(summarize_existing_values(existing_values), default=str)
+            suffix += (
+                "\nValues already used for unique fields (do not reuse them; "
+                f"only the most recent are listed):\n{summary}\n"
+            )
+
+        if seed:
+            suffix += f"\nRandom Seed: {seed}\n"
+
+        suffix += f"\nNumber of rows to generate: {num_rows}\n"
+        return prefix, suffix
 
     def _normalize_relationships(self, relationships_data: Any) -> dict[str, list[str]] | None:
         """Coerce LLM-provided relationship info into expected structure."""
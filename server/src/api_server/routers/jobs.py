@@ -4,8 +4,8 @@ import asyncio
 import csv
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 
 from src.api.gemini_client import get_gemini_client
@@ -20,12 +20,23 @@ from src.core.models import (
     OutputFormat,
     StorageType,
 )
-from src.storage.handlers import get_storage_handler
+from src.storage.handlers import (
+    drop_used_unique_values,
+    get_storage_handler,
+    rows_to_table,
+)
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Long-polling status requests re-check the in-memory job at this interval
+STATUS_WAIT_INTERVAL_SECONDS = 0.25
+STATUS_MAX_WAIT_SECONDS = 30.0
+FINAL_JOB_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
 
 class CreateJobRequest(BaseModel):
     """Request model for creating a generation job."""
@@ -54,6 +65,7 @@ class JobStatusResponse(BaseModel):
     chunks_completed: int
     total_chunks: int
     progress_percentage: float
+    version: int
     error_message: str | None = None
 
 
@@ -118,11 +130,18 @@ async def create_job(request: CreateJobRequest, background_tasks: BackgroundTask
 
 
 @router.get("/{job_id}/status", response_model=JobStatusResponse)
-async def get_job_status(job_id: UUID):
+async def get_job_status(job_id: UUID, since_version: int | None = None, wait: float = 0):
     """Get status of a specific job.
     
+    With ``since_version`` and ``wait`` the request long-polls: it returns as
+    soon as the job's progress version moves past ``since_version`` (any
+    progress or status change, including pause and resume) or the job has
+    finished, or once ``wait`` seconds have passed.
+
     Args:
         job_id: Job identifier
+        since_version: Progress version the client last saw
+        wait: Maximum seconds to wait for a change (capped)
         
     Returns:
         Job status information
@@ -134,16 +153,17 @@ async def get_job_status(job_id: UUID):
         if not job:
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
-        return JobStatusResponse(
-            job_id=job.specification.job_id,
-            status=job.progress.status,
-            rows_generated=job.progress.rows_generated,
-            total_rows=job.specification.total_rows,
-            chunks_completed=job.progress.chunks_completed,
-            total_chunks=job.progress.total_chunks,
-            progress_percentage=job.progress.progress_percentage,
-            error_message=job.progress.error_message
-        )
+        if since_version is not None and wait > 0:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + min(wait, STATUS_MAX_WAIT_SECONDS)
+            while (
+                job.progress.version <= since_version
+                and job.progress.status not in FINAL_JOB_STATUSES
+                and loop.time() < deadline
+            ):
+                await asyncio.sleep(STATUS_WAIT_INTERVAL_SECONDS)
+
+        return _job_status_response(job)
 
     except HTTPException:
         raise
@@ -152,6 +172,21 @@ async def get_job_status(job_id: UUID):
         raise HTTPException(status_code=500, detail=f"Failed to get job status: {str(e)}")
 
 
+def _job_status_response(job: JobState) -> JobStatusResponse:
+    """Build the status response for a job."""
+    return JobStatusResponse(
+        job_id=job.specification.job_id,
+        status=job.progress.status,
+        rows_generated=job.progress.rows_generated,
+        total_rows=job.specification.total_rows,
+        chunks_completed=job.progress.chunks_completed,
+        total_chunks=job.progress.total_chunks,
+        progress_percentage=job.progress.progress_percentage,
+        version=job.progress.version,
+        error_message=job.progress.error_message
+    )
+
+
 @router.get("/{job_id}", response_model=JobState)
 async def get_job_details(job_id: UUID):
     """Get detailed information about a job.
@@ -283,15 +318,19 @@ async def download_job_output(job_id: UUID):
 
 
 @router.get("/{job_id}/preview")
-async def preview_job_output(job_id: UUID, rows: int = 10):
+async def preview_job_output(job_id: UUID, request: Request, rows: int = 10):
     """Preview the first few rows of generated data.
     
+    Clients that accept ``application/vnd.apache.arrow.stream`` get the rows as
+    an Arrow IPC stream, with the dataset size in the ``X-Total-Rows`` header.
+
     Args:
         job_id: Job identifier
+        request: Incoming request, used for content negotiation
         rows: Number of rows to preview (default 10, max 100)
         
     Returns:
-        Preview data as JSON
+        Preview data as JSON or an Arrow IPC stream
     """
     try:
         rows = min(rows, 100)  # Limit preview size
@@ -320,6 +359,16 @@ async def preview_job_output(job_id: UUID, rows: int = 10):
                     break
                 preview_data.append(row)
 
+        if ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", ""):
+            content = _arrow_stream(preview_data)
+            # Rows Arrow cannot type are still served as the JSON preview
+            if content is not None:
+                return Response(
+                    content=content,
+                    media_type=ARROW_STREAM_MEDIA_TYPE,
+                    headers={"X-Total-Rows": str(job.progress.rows_generated)}
+                )
+
         return {
             "job_id": str(job_id),
             "total_rows": job.progress.rows_generated,
@@ -334,6 +383,21 @@ async def preview_job_output(job_id: UUID, rows: int = 10):
         raise HTTPException(status_code=500, detail=f"Failed to preview output: {str(e)}")
 
 
+def _arrow_stream(rows: list[dict]) -> bytes | None:
+    """Serialize rows as an Arrow IPC stream, or return None if Arrow cannot type them."""
+    import pyarrow as pa
+
+    try:
+        table = rows_to_table(rows)
+    except (pa.ArrowException, TypeError) as e:
+        logger.warning(f"Arrow preview unavailable, falling back to JSON: {e}")
+        return None
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
 async def generate_data(job_id: UUID):
     """Background task to generate data for a job.
     
@@ -347,6 +411,7 @@ async def generate_data(job_id: UUID):
         logger.error(f"Job {job_id} not found")
         return
 
+    pending: set[asyncio.Task] = set()
     try:
         logger.info(f"Starting data generation for job {job_id}")
         job_manager.update_job_status(job_id, JobStatus.GENERATING)
@@ -359,54 +424,99 @@ async def generate_data(job_id: UUID):
             field: []
             for field in job.specification.uniqueness_fields
         }
+        # The prompt only summarizes used values, so repeats are dropped here before storage
+        unique_seen = {field: set() for field in unique_values}
 
-        # Generate chunks
+        # Generate chunks through a pool topped up as chunks finish, so one slow
+        # Gemini call never holds back the others. Each chunk is prompted with the unique
+        # values known when it starts, so jobs with unique fields run one chunk at a time
+        # to keep in-flight chunks from reusing each other's values.
         total_chunks = job.progress.total_chunks
         remaining_rows = job.specification.total_rows
-
-        for chunk_id in range(total_chunks):
-            # Check if job is paused or cancelled
-            job = job_manager.get_job(job_id)
-            if job.progress.status == JobStatus.PAUSED:
-                logger.info(f"Job {job_id} paused at chunk {chunk_id}")
-                while job.progress.status == JobStatus.PAUSED:
-                    await asyncio.sleep(1)
-                    job = job_manager.get_job(job_id)
-
-            if job.progress.status == JobStatus.CANCELLED:
-                logger.info(f"Job {job_id} cancelled at chunk {chunk_id}")
-                return
-
-            # Calculate rows for this chunk
-            rows_in_chunk = min(job.specification.chunk_size, remaining_rows)
-
+        if unique_values:
+            max_workers = 1
+        else:
+            max_workers = settings.generation.max_concurrent_chunks
+
+        async def run_chunk(
+            chunk_id: int,
+            rows_in_chunk: int,
+            existing_values: dict[str, list] | None
+        ):
             logger.info(f"Generating chunk {chunk_id + 1}/{total_chunks} ({rows_in_chunk} rows)")
 
             # Generate data
-            data = gemini_client.generate_data_chunk(
+            data = await asyncio.to_thread(
+                gemini_client.generate_data_chunk,
                 schema=job.specification.schema,
                 num_rows=rows_in_chunk,
-                existing_values=unique_values if unique_values else None,
+                existing_values=existing_values,
                 seed=job.specification.seed
             )
 
-            # Update unique values
-            for field in job.specification.uniqueness_fields:
-                if field in data[0]:
-                    unique_values[field].extend([row[field] for row in data])
+            # Cancelling the pool cannot stop a running worker thread, so check again
+            if job_manager.get_job(job_id).progress.status == JobStatus.CANCELLED:
+                logger.info(f"Job {job_id} cancelled, discarding chunk {chunk_id}")
+                return data, None
+
+            if unique_seen:
+                data = drop_used_unique_values(data, unique_seen)
 
             # Store chunk
-            chunk_metadata = storage_handler.store_chunk(
+            chunk_metadata = await asyncio.to_thread(
+                storage_handler.store_chunk,
                 job_id=job_id,
                 chunk_id=chunk_id,
                 data=data,
                 format=job.specification.output_format
             )
+            return data, chunk_metadata
 
-            # Update job
-            job_manager.add_chunk(job_id, chunk_metadata)
+        next_chunk = 0
+        paused = False
+        while pending or next_chunk < total_chunks:
+            # Check if job is paused or cancelled before handing out more chunks
+            job = job_manager.get_job(job_id)
+            if job.progress.status == JobStatus.CANCELLED:
+                logger.info(f"Job {job_id} cancelled at chunk {next_chunk}")
+                return
 
-            remaining_rows -= rows_in_chunk
+            if job.progress.status == JobStatus.PAUSED:
+                if not paused:
+                    logger.info(f"Job {job_id} paused at chunk {next_chunk}")
+                    paused = True
+            else:
+                paused = False
+                while len(pending) < max_workers and next_chunk < total_chunks:
+                    # Calculate rows for this chunk
+                    rows_in_chunk = min(job.specification.chunk_size, remaining_rows)
+                    existing_values = {
+                        field: list(values) for field, values in unique_values.items()
+                    } if unique_values else None
+                    pending.add(asyncio.create_task(
+                        run_chunk(next_chunk, rows_in_chunk, existing_values)
+                    ))
+                    remaining_rows -= rows_in_chunk
+                    next_chunk += 1
+
+            if not pending:
+                # Paused with nothing in flight
+                await asyncio.sleep(1)
+                continue
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                data, chunk_metadata = task.result()
+                if chunk_metadata is None:
+                    continue
+
+                # Update unique values
+                for field in job.specification.uniqueness_fields:
+                    if data and field in data[0]:
+                        unique_values[field].extend([row[field] for row in data])
+
+                # Update job
+                job_manager.add_chunk(job_id, chunk_metadata)
 
         # Consolidate chunks into final output
         logger.info(f"Consolidating chunks for job {job_id}")
@@ -425,3 +535,6 @@ async def generate_data(job_id: UUID):
     except Exception as e:
         logger.error(f"Error generating data for job {job_id}: {e}")
         job_manager.update_job_status(job_id, JobStatus.FAILED, error=str(e))
+    finally:
+        for task in pending:
+            task.cancel()
@@ -3,7 +3,7 @@
 from pathlib import Path
 from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,6 +16,9 @@ class GeminiConfig(BaseModel):
     temperature: float = 0.7
     top_p: float = 0.95
     top_k: int = 40
+    context_cache_enabled: bool = False
+    context_cache_ttl: int = Field(default=3600, ge=60)  # Seconds Gemini keeps a cached prefix
+    context_cache_min_tokens: int = 4096  # Shorter prefixes are not eligible for caching
 
 
 class MCPServerConfig(BaseModel):
@@ -31,6 +34,7 @@ class StorageConfig(BaseModel):
     temp_path: Path = Path("./temp")
     output_path: Path = Path("./output")
     max_memory_chunks: int = 100
+    checksum_algorithm: Literal["sha256", "crc32c"] = "sha256"
 
     # Cloud storage options
     cloud_bucket: str | None = None
@@ -47,6 +51,9 @@ class GenerationConfig(BaseModel):
     max_chunk_size: int = 5000
     min_chunk_size: int = 100
     default_output_format: Literal["csv", "json", "parquet"] = "csv"
+    max_concurrent_chunks: int = 4
+    max_rows_per_request: int = 1000  # Smaller chunks in a batch share one LLM request
+    target_batch_rows: int = 65536
 
 
 class JobConfig(BaseModel):
@@ -70,6 +77,21 @@ class VectorStoreConfig(BaseModel):
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     similarity_threshold: float = 0.85  # Higher threshold = stricter dedup (0.85 means 85% similar)
     max_retry_attempts: int = 3
+    in_memory_limit: int = 100_000  # Search a numpy mirror of the collection up to this size
+
+
+class CacheConfig(BaseModel):
+    """LLM response cache configuration."""
+    enabled: bool = True
+    extract_schema_dir: Path = Path("./temp/cache/extract_schema")
+    generate_chunk_dir: Path = Path("./temp/cache/generate_chunk")
+    # Size budgets; least recently used entries are evicted once a cache exceeds its budget
+    extract_schema_max_bytes: int = 64 * 1024 * 1024
+    generate_chunk_max_bytes: int = 1024 * 1024 * 1024
+    semantic_enabled: bool = False
+    semantic_dir: Path = Path("./temp/cache/semantic")
+    semantic_threshold: float = 0.92  # Cosine similarity needed to reuse a paraphrased extraction
+    semantic_model: str = "sentence-transformers/all-MiniLM-L6-v2"
 
 
 class LangfuseConfig(BaseModel):
@@ -95,6 +117,9 @@ class Settings(BaseSettings):
     gemini_model: str = "gemini-1.5-pro"
     gemini_max_retries: int = 3
     gemini_timeout: int = 120
+    gemini_context_cache_enabled: bool = False
+    gemini_context_cache_ttl: int = Field(default=3600, ge=60)
+    gemini_context_cache_min_tokens: int = 4096
 
     # MCP Server
     mcp_server_host: str = "localhost"
@@ -106,6 +131,7 @@ class Settings(BaseSettings):
     temp_storage_path: str = "./temp"
     output_storage_path: str = "./output"
     max_memory_chunks: int = 100
+    checksum_algorithm: Literal["sha256", "crc32c"] = "sha256"
 
     # Cloud Storage (optional)
     cloud_storage_bucket: str | None = None
@@ -120,6 +146,9 @@ class Settings(BaseSettings):
     max_chunk_size: int = 5000
     min_chunk_size: int = 100
     default_output_format: Literal["csv", "json", "parquet"] = "csv"
+    max_concurrent_chunks: int = 4
+    max_rows_per_request: int = 1000
+    target_batch_rows: int = 65536
 
     # Job Management
     job_persistence_path: str = "./temp/jobs"
@@ -130,6 +159,17 @@ class Settings(BaseSettings):
     rate_limit_requests_per_minute: int = 60
     rate_limit_tokens_per_minute: int = 50000
 
+    # LLM response cache
+    cache_enabled: bool = True
+    extract_schema_cache_dir: str = "./temp/cache/extract_schema"
+    generate_chunk_cache_dir: str = "./temp/cache/generate_chunk"
+    extract_schema_cache_max_bytes: int = 64 * 1024 * 1024
+    generate_chunk_cache_max_bytes: int = 1024 * 1024 * 1024
+    semantic_cache_enabled: bool = False
+    semantic_cache_dir: str = "./temp/cache/semantic"
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+
     # Logging
     log_level: str = "INFO"
     log_file: str = "./logs/app.log"
@@ -147,6 +187,7 @@ class Settings(BaseSettings):
     vector_store_embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     vector_store_similarity_threshold: float = 0.85  # Higher threshold = stricter dedup (0.85 means 85% similar)
     vector_store_max_retry_attempts: int = 3
+    vector_store_in_memory_limit: int = 100_000
 
     @property
     def gemini(self) -> GeminiConfig:
@@ -155,7 +196,10 @@ class Settings(BaseSettings):
             api_key=self.gemini_api_key,
             model=self.gemini_model,
             max_retries=self.gemini_max_retries,
-            timeout=self.gemini_timeout
+            timeout=self.gemini_timeout,
+            context_cache_enabled=self.gemini_context_cache_enabled,
+            context_cache_ttl=self.gemini_context_cache_ttl,
+            context_cache_min_tokens=self.gemini_context_cache_min_tokens
         )
 
     @property
@@ -175,6 +219,7 @@ class Settings(BaseSettings):
             temp_path=Path(self.temp_storage_path),
             output_path=Path(self.output_storage_path),
             max_memory_chunks=self.max_memory_chunks,
+            checksum_algorithm=self.checksum_algorithm,
             cloud_bucket=self.cloud_storage_bucket,
             cloud_region=self.cloud_storage_region,
             aws_access_key=self.aws_access_key_id,
@@ -190,7 +235,10 @@ class Settings(BaseSettings):
             default_chunk_size=self.default_chunk_size,
             max_chunk_size=self.max_chunk_size,
             min_chunk_size=self.min_chunk_size,
-            default_output_format=self.default_output_format
+            default_output_format=self.default_output_format,
+            max_concurrent_chunks=self.max_concurrent_chunks,
+            max_rows_per_request=self.max_rows_per_request,
+            target_batch_rows=self.target_batch_rows
         )
 
     @property
@@ -210,6 +258,21 @@ class Settings(BaseSettings):
             tokens_per_minute=self.rate_limit_tokens_per_minute
         )
 
+    @property
+    def cache(self) -> CacheConfig:
+        """Get LLM response cache configuration."""
+        return CacheConfig(
+            enabled=self.cache_enabled,
+            extract_schema_dir=Path(self.extract_schema_cache_dir),
+            generate_chunk_dir=Path(self.generate_chunk_cache_dir),
+            extract_schema_max_bytes=self.extract_schema_cache_max_bytes,
+            generate_chunk_max_bytes=self.generate_chunk_cache_max_bytes,
+            semantic_enabled=self.semantic_cache_enabled,
+            semantic_dir=Path(self.semantic_cache_dir),
+            semantic_threshold=self.semantic_cache_threshold,
+            semantic_model=self.semantic_cache_model
+        )
+
     @property
     def langfuse(self) -> LangfuseConfig:
         """Get Langfuse telemetry configuration."""
@@ -233,6 +296,7 @@ class Settings(BaseSettings):
             embedding_model=self.vector_store_embedding_model,
             similarity_threshold=self.vector_store_similarity_threshold,
             max_retry_attempts=self.vector_store_max_retry_attempts,
+            in_memory_limit=self.vector_store_in_memory_limit,
         )
 
     @property
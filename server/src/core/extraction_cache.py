@@ -0,0 +1,321 @@
+"""Content-addressable caches for LLM responses."""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import orjson
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Once a cache outgrows its byte budget, least recently used entries are removed until
+# it is back under this fraction of the budget, so eviction does not run on every put
+_EVICT_TO_FRACTION = 0.9
+
+
+class ExtractionCache:
+    """Stores LLM responses on disk, keyed by a hash of their inputs."""
+
+    def __init__(self, cache_dir: Path | None = None, max_bytes: int | None = None):
+        """Initialize extraction cache.
+
+        Args:
+            cache_dir: Optional cache directory, uses settings if not provided
+            max_bytes: Optional size budget for all entries, uses settings if not provided
+        """
+        self.cache_dir = cache_dir or settings.cache.extract_schema_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else settings.cache.extract_schema_max_bytes
+        )
+        self._lock = threading.Lock()
+        # Running total of entry sizes; recounted from disk whenever entries are evicted,
+        # which also picks up entries written by other processes sharing the directory
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the request inputs.
+
+        Each part is length-prefixed before hashing so that different splits of
+        the same concatenated text never collide.
+
+        Args:
+            *parts: Provider, model, prompt version and request fields
+
+        Returns:
+            Hex SHA-256 digest identifying the request
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            encoded = part.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _entries(self) -> list[os.DirEntry]:
+        with os.scandir(self.cache_dir) as entries:
+            return [entry for entry in entries if entry.name.endswith(".json")]
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response payload or None on a miss
+        """
+        path = self._path(key)
+        try:
+            entry = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except orjson.JSONDecodeError:
+            logger.warning(f"Discarding corrupt cache entry {key} in {self.cache_dir}")
+            self.evict(key)
+            return None
+        try:
+            # Eviction removes the least recently modified entries first
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("response")
+
+    def put(
+        self,
+        key: str,
+        response: dict[str, Any],
+        provider: str,
+        model: str,
+        prompt_version: str
+    ):
+        """Store a response.
+
+        Args:
+            key: Cache key from make_key
+            response: JSON-serializable response payload
+            provider: LLM provider that produced the response
+            model: Model name that produced the response
+            prompt_version: Version of the prompt that produced the response
+        """
+        entry = {
+            "provider": provider,
+            "model": model,
+            "prompt_version": prompt_version,
+            "created_at": datetime.now(),
+            "response": response
+        }
+        data = orjson.dumps(entry)
+        path = self._path(key)
+        with self._lock:
+            previous_size = _file_size(path)
+            _replace_file(path, data)
+            self._size += len(data) - previous_size
+            if self._size > self.max_bytes:
+                self._evict_least_recently_used()
+
+    def evict(self, key: str):
+        """Remove a cached response if present."""
+        path = self._path(key)
+        with self._lock:
+            self._size -= _file_size(path)
+            path.unlink(missing_ok=True)
+
+    def _evict_least_recently_used(self):
+        """Remove the least recently used entries until the cache is back under budget."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = self.max_bytes * _EVICT_TO_FRACTION
+        evicted = 0
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+            evicted += 1
+
+        self._size = size
+        logger.info(f"Evicted {evicted} entries from cache {self.cache_dir}")
+
+
+class SemanticExtractionIndex:
+    """Maps paraphrased user inputs onto cache keys of earlier extractions.
+
+    Embeddings are L2-normalized, so cosine similarity is a dot product against
+    the stored matrix. Matches are only considered within the same scope (the
+    non-text inputs of the request) so differing context never reuses a schema.
+    """
+
+    def __init__(self, index_dir: Path | None = None, threshold: float | None = None):
+        """Initialize semantic index.
+
+        Args:
+            index_dir: Optional index directory, uses settings if not provided
+            threshold: Optional cosine similarity threshold, uses settings if not provided
+        """
+        config = settings.cache
+        self.index_dir = index_dir or config.semantic_dir
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold if threshold is not None else config.semantic_threshold
+        self._model_name = config.semantic_model
+        self._embedder = None
+        self._lock = threading.Lock()
+
+        self._embeddings_path = self.index_dir / "embeddings.npy"
+        self._entries_path = self.index_dir / "entries.json"
+        self._embeddings: np.ndarray | None = None
+        self._entries: list[dict[str, str]] = []
+        if self._embeddings_path.exists() and self._entries_path.exists():
+            self._embeddings = np.load(self._embeddings_path)
+            self._entries = orjson.loads(self._entries_path.read_bytes())
+            if len(self._embeddings) != len(self._entries):
+                # A crash between the two writes in add(); start over rather than mismatch rows
+                logger.warning(
+                    "Discarding semantic extraction index in %s: %s embeddings for %s entries",
+                    self.index_dir,
+                    len(self._embeddings),
+                    len(self._entries),
+                )
+                self._embeddings = None
+                self._entries = []
+
+    def _encode(self, text: str) -> np.ndarray:
+        if self._embedder is None:
+            # Loaded lazily: the model is only needed once a lookup misses the exact cache
+            from sentence_transformers import SentenceTransformer
+
+            logger.info(f"Loading sentence transformer model: {self._model_name}")
+            self._embedder = SentenceTransformer(self._model_name)
+        vector = self._embedder.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+        return vector.astype(np.float32)
+
+    def lookup(self, text: str, scope: str) -> str | None:
+        """Find the cache key of the most similar earlier input.
+
+        Args:
+            text: User input to match
+            scope: Key of the remaining request inputs that must match exactly
+
+        Returns:
+            Matching cache key or None if nothing is similar enough
+        """
+        with self._lock:
+            if self._embeddings is None or not self._entries:
+                return None
+
+            scores = self._embeddings @ self._encode(text)
+            for index in np.argsort(scores)[::-1]:
+                if scores[index] < self.threshold:
+                    break
+                entry = self._entries[index]
+                if entry["scope"] == scope:
+                    logger.info(f"Semantic extraction cache hit (similarity {scores[index]:.3f})")
+                    return entry["key"]
+
+        logger.debug("Semantic extraction cache miss")
+        return None
+
+    def add(self, text: str, scope: str, key: str):
+        """Index an input under the cache key of its extraction.
+
+        Args:
+            text: User input that was extracted
+            scope: Key of the remaining request inputs
+            key: Cache key the response is stored under
+        """
+        with self._lock:
+            vector = self._encode(text)[np.newaxis, :]
+            if self._embeddings is None:
+                self._embeddings = vector
+            else:
+                self._embeddings = np.vstack([self._embeddings, vector])
+            self._entries.append({"scope": scope, "key": key})
+
+            buffer = io.BytesIO()
+            np.save(buffer, self._embeddings)
+            _replace_file(self._embeddings_path, buffer.getvalue())
+            _replace_file(self._entries_path, orjson.dumps(self._entries))
+
+
+def _replace_file(path: Path, data: bytes):
+    """Write a file through a temporary file and an atomic rename.
+
+    The temporary file gets a unique name in the same directory, so concurrent
+    writers of one path never share it and the rename never crosses filesystems.
+    Readers see either the old or the new contents, never a partial file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+# Global extraction cache instance
+_extraction_cache: ExtractionCache | None = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get or create global extraction cache instance."""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache()
+    return _extraction_cache
+
+
+_chunk_cache: ExtractionCache | None = None
+
+
+def get_chunk_cache() -> ExtractionCache:
+    """Get or create global generated chunk cache instance."""
+    global _chunk_cache
+    if _chunk_cache is None:
+        _chunk_cache = ExtractionCache(
+            settings.cache.generate_chunk_dir, settings.cache.generate_chunk_max_bytes
+        )
+    return _chunk_cache
+
+
+_semantic_index: SemanticExtractionIndex | None = None
+
+
+def get_semantic_index() -> SemanticExtractionIndex:
+    """Get or create global semantic extraction index."""
+    global _semantic_index
+    if _semantic_index is None:
+        _semantic_index = SemanticExtractionIndex()
+    return _semantic_index
@@ -4,6 +4,7 @@ import asyncio
 import json
 from collections import deque
 from datetime import datetime, timedelta
+from itertools import islice
 from uuid import UUID
 
 from src.config import settings
@@ -106,27 +107,30 @@ class JobManager:
             job.progress.started_at = datetime.now()
         elif status == JobStatus.COMPLETED:
             job.progress.completed_at = datetime.now()
-            job.progress.progress_percentage = 100.0
         elif status == JobStatus.PAUSED:
             job.progress.paused_at = datetime.now()
         elif status == JobStatus.FAILED:
             job.progress.error_message = error
             job.progress.completed_at = datetime.now()
 
+        job.progress.version += 1
         self._persist_job(job)
         logger.info(f"Job {job_id} status updated to {status}")
 
-    def add_chunk(self, job_id: UUID, chunk: ChunkMetadata):
+    def add_chunk(self, job_id: UUID, chunk: ChunkMetadata) -> JobProgress | None:
         """Add completed chunk to job.
         
         Args:
             job_id: Job identifier
             chunk: Chunk metadata
+
+        Returns:
+            Updated job progress or None if job not found
         """
         job = self.jobs.get(job_id)
         if not job:
             logger.warning(f"Job {job_id} not found for chunk addition")
-            return
+            return None
 
         job.add_chunk(chunk)
         self._persist_job(job)
@@ -137,6 +141,8 @@ class JobManager:
             f"{job.progress.progress_percentage:.1f}%)"
         )
 
+        return job.progress
+
     def validate_schema(self, job_id: UUID):
         """Mark job schema as validated.
         
@@ -199,6 +205,7 @@ class JobManager:
                 # Reset to last successful chunk
                 job.progress.status = JobStatus.PENDING
                 job.progress.error_message = None
+                job.progress.version += 1
                 self._persist_job(job)
                 return True
             else:
@@ -221,15 +228,14 @@ class JobManager:
         Returns:
             List of job states
         """
-        jobs = list(self.jobs.values())
+        # self.jobs is kept in creation order, so walking it backwards yields newest
+        # first and stops as soon as enough jobs are found
+        jobs = reversed(self.jobs.values())
 
         if status:
-            jobs = [j for j in jobs if j.progress.status == status]
+            jobs = (j for j in jobs if j.progress.status == status)
 
-        # Sort by created date (newest first)
-        jobs.sort(key=lambda j: j.specification.created_at, reverse=True)
-
-        return jobs[:limit]
+        return list(islice(jobs, limit))
 
     def cleanup_old_jobs(self, days: int = None):
         """Clean up old completed/failed jobs.
@@ -280,6 +286,11 @@ class JobManager:
         except Exception as e:
             logger.error(f"Failed to load jobs: {e}")
 
+        # Keep self.jobs in creation order so list_jobs never has to sort
+        self.jobs = dict(
+            sorted(self.jobs.items(), key=lambda item: item[1].specification.created_at)
+        )
+
     def _remove_job(self, job_id: UUID):
         """Remove job from memory and disk.
         
@@ -2,10 +2,11 @@
 
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field
 
 
 class FieldType(str, Enum):
@@ -62,6 +63,18 @@ class FieldConstraint(BaseModel):
     format: str | None = None
     default: Any | None = None
 
+    # Hashed copy of enum_values, rebuilt whenever the list is replaced
+    _enum_set: frozenset[str] | None = PrivateAttr(default=None)
+    _enum_source: list[str] | None = PrivateAttr(default=None)
+
+    @property
+    def enum_set(self) -> frozenset[str] | None:
+        """Allowed enum values as a frozenset for constant-time membership checks."""
+        if self._enum_source is not self.enum_values:
+            self._enum_set = frozenset(self.enum_values) if self.enum_values else None
+            self._enum_source = self.enum_values
+        return self._enum_set
+
 
 class FieldDefinition(BaseModel):
     """Definition of a single field in the schema."""
@@ -90,21 +103,34 @@ class DataSchema(BaseModel):
 
     def validate_constraints(self) -> list[str]:
         """Validate schema constraints and return any issues."""
-        issues = []
-        field_names = {f.name for f in self.fields}
+        field_specs = tuple((f.name, tuple(f.depends_on or ())) for f in self.fields)
+        return list(_validate_schema(field_specs))
 
-        # Check for duplicate field names
-        if len(field_names) != len(self.fields):
-            issues.append("Duplicate field names detected")
 
-        # Check field dependencies
-        for field in self.fields:
-            if field.depends_on:
-                for dep in field.depends_on:
-                    if dep not in field_names:
-                        issues.append(f"Field '{field.name}' depends on non-existent field '{dep}'")
+@lru_cache(maxsize=256)
+def _validate_schema(field_specs: tuple[tuple[str, tuple[str, ...]], ...]) -> tuple[str, ...]:
+    """Validate field names and dependencies, cached by schema content.
+
+    Args:
+        field_specs: Tuple of (field name, dependencies) pairs in schema order
+
+    Returns:
+        Tuple of validation issues
+    """
+    issues = []
+    field_names = {name for name, _ in field_specs}
 
-        return issues
+    # Check for duplicate field names
+    if len(field_names) != len(field_specs):
+        issues.append("Duplicate field names detected")
+
+    # Check field dependencies
+    for name, depends_on in field_specs:
+        for dep in depends_on:
+            if dep not in field_names:
+                issues.append(f"Field '{name}' depends on non-existent field '{dep}'")
+
+    return tuple(issues)
 
 
 class ChunkMetadata(BaseModel):
@@ -145,13 +171,18 @@ class JobProgress(BaseModel):
     completed_at: datetime | None = None
     paused_at: datetime | None = None
     error_message: str | None = None
-    progress_percentage: float = 0.0
     estimated_completion: datetime | None = None
-
-    def update_progress(self):
-        """Update progress percentage."""
+    version: int = 0  # Bumped on every progress change so pollers can skip unchanged reads
+
+    @computed_field
+    @property
+    def progress_percentage(self) -> float:
+        """Percentage of chunks completed, derived on access."""
+        if self.status == JobStatus.COMPLETED:
+            return 100.0
         if self.total_chunks > 0:
-            self.progress_percentage = (self.chunks_completed / self.total_chunks) * 100
+            return (self.chunks_completed / self.total_chunks) * 100
+        return 0.0
 
 
 class JobState(BaseModel):
@@ -162,12 +193,40 @@ class JobState(BaseModel):
     schema_validated: bool = False
     can_resume: bool = True
 
+    # Cached summary for job listings, rebuilt when progress.version moves
+    _list_view: dict[str, Any] | None = PrivateAttr(default=None)
+    _list_view_version: int = PrivateAttr(default=-1)
+    # Completed chunk ids, built from chunks on first use (e.g. after loading from disk)
+    _chunk_ids: set[int] | None = PrivateAttr(default=None)
+
     def add_chunk(self, chunk: ChunkMetadata):
         """Add completed chunk and update progress."""
         self.chunks.append(chunk)
+        if self._chunk_ids is not None:
+            self._chunk_ids.add(chunk.chunk_id)
         self.progress.chunks_completed += 1
         self.progress.rows_generated += chunk.rows_generated
-        self.progress.update_progress()
+        self.progress.version += 1
+
+    def has_chunk(self, chunk_id: int) -> bool:
+        """Check whether a chunk has already been stored for this job."""
+        if self._chunk_ids is None:
+            self._chunk_ids = {chunk.chunk_id for chunk in self.chunks}
+        return chunk_id in self._chunk_ids
+
+    def list_view(self) -> dict[str, Any]:
+        """Get the job summary used in listings, cached until progress changes."""
+        if self._list_view is None or self._list_view_version != self.progress.version:
+            self._list_view = {
+                "job_id": self.specification.job_id,
+                "status": self.progress.status.value,
+                "total_rows": self.specification.total_rows,
+                "rows_generated": self.progress.rows_generated,
+                "progress_percentage": self.progress.progress_percentage,
+                "created_at": self.specification.created_at
+            }
+            self._list_view_version = self.progress.version
+        return self._list_view
 
 
 class SchemaExtractionRequest(BaseModel):
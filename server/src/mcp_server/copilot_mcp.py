@@ -11,14 +11,48 @@ to generate high-quality synthetic data.
 import csv
 import json
 from pathlib import Path
+from string import Template
 from typing import Any
 
+import orjson
 from fastmcp import FastMCP
 
 # Initialize FastMCP server
 mcp = FastMCP("synthetic-data-copilot")
 
 
+def _reply(payload: dict[str, Any]) -> str:
+    """Serialize a tool response as indented JSON using the shared orjson encoder."""
+    return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode()
+
+
+# Task prompt for schema extraction, parsed once at import time
+_CONTEXT_TEMPLATE = Template("""
+Dataset Description: $description
+Target Rows: $num_rows
+
+TASK: Analyze this description and create a detailed schema for CSV generation.
+
+OUTPUT REQUIREMENTS:
+1. Identify all fields mentioned or implied in the description
+2. For each field, specify:
+   - name: Field name (use snake_case)
+   - type: Data type (string, integer, float, boolean, date, email, phone, etc.)
+   - description: What this field represents
+   - constraints: Any rules (min, max, unique, required, format, enum values)
+   - sample_values: 3-5 example values that show the expected format/range
+   - generation_hint: Specific instructions for generating this field
+
+3. Identify relationships between fields (e.g., "sale_price must be <= msrp")
+4. Provide generation hints for creating realistic, coherent data
+5. List the exact CSV column headers in order
+
+IMPORTANT: The schema should enable generating diverse, realistic data that matches
+real-world patterns. Include enough detail that an LLM can generate the data without
+additional context.
+""")
+
+
 @mcp.tool()
 def extract_schema_from_description(
     description: str,
@@ -58,40 +92,17 @@ def extract_schema_from_description(
     }
     
     # Add example data context if provided
-    context = f"""
-Dataset Description: {description}
-Target Rows: {num_rows}
-
-TASK: Analyze this description and create a detailed schema for CSV generation.
-
-OUTPUT REQUIREMENTS:
-1. Identify all fields mentioned or implied in the description
-2. For each field, specify:
-   - name: Field name (use snake_case)
-   - type: Data type (string, integer, float, boolean, date, email, phone, etc.)
-   - description: What this field represents
-   - constraints: Any rules (min, max, unique, required, format, enum values)
-   - sample_values: 3-5 example values that show the expected format/range
-   - generation_hint: Specific instructions for generating this field
-
-3. Identify relationships between fields (e.g., "sale_price must be <= msrp")
-4. Provide generation hints for creating realistic, coherent data
-5. List the exact CSV column headers in order
-
-IMPORTANT: The schema should enable generating diverse, realistic data that matches
-real-world patterns. Include enough detail that an LLM can generate the data without
-additional context.
-"""
+    context = _CONTEXT_TEMPLATE.substitute(description=description, num_rows=num_rows)
     
     if example_data:
         context += f"\n\nEXAMPLE DATA FOR REFERENCE:\n{example_data}\n"
     
-    return json.dumps({
+    return _reply({
         "status": "schema_extraction_ready",
         "task": context,
         "template": schema_template,
         "next_step": "Populate the template with detailed field definitions based on the description"
-    }, indent=2)
+    })
 
 
 @mcp.tool()
@@ -125,10 +136,10 @@ def generate_csv_dataset(
     try:
         schema = json.loads(schema_json)
     except json.JSONDecodeError as e:
-        return json.dumps({
+        return _reply({
             "status": "error",
             "message": f"Invalid JSON schema: {str(e)}"
-        }, indent=2)
+        })
     
     # Determine output path
     if not output_path:
@@ -205,7 +216,7 @@ Generate the data starting with the header row, then {num_rows} data rows.
 Make it realistic, diverse, and production-ready.
 """
     
-    return json.dumps({
+    return _reply({
         "status": "generation_ready",
         "output_path": output_path,
         "num_rows": num_rows,
@@ -213,7 +224,7 @@ Make it realistic, diverse, and production-ready.
         "generation_guide": generation_guide,
         "schema": schema,
         "next_step": "Generate the CSV content and save to the output path"
-    }, indent=2)
+    })
 
 
 @mcp.tool()
@@ -278,20 +289,20 @@ def save_csv_content(
         # Get file stats
         file_size = output_file.stat().st_size
         
-        return json.dumps({
+        return _reply({
             "status": "success",
             "output_path": str(output_file),
             "file_size_bytes": file_size,
             "file_size_kb": round(file_size / 1024, 2),
             "validation": validation_results,
             "message": f"CSV dataset saved successfully to {output_file}"
-        }, indent=2)
+        })
         
     except Exception as e:
-        return json.dumps({
+        return _reply({
             "status": "error",
             "message": f"Failed to save CSV: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -354,7 +365,7 @@ def get_example_schemas() -> str:
         }
     }
     
-    return json.dumps(examples, indent=2)
+    return _reply(examples)
 
 
 if __name__ == "__main__":
@@ -8,29 +8,48 @@ This module implements the Model Context Protocol server with tools for:
 - Dataset download
 """
 
+import asyncio
+import logging
+import threading
+from pathlib import Path
 from typing import Any
 from uuid import UUID
 
+import orjson
 from mcp.server import Server
 from mcp.types import EmbeddedResource, ImageContent, TextContent, Tool
+from pydantic import ValidationError
 
-from src.api.gemini_client import get_gemini_client
+from src.api.gemini_client import DATA_PROMPT_VERSION, SCHEMA_PROMPT_VERSION, get_gemini_client
 from src.config import settings
+from src.core.extraction_cache import get_chunk_cache, get_extraction_cache, get_semantic_index
 from src.core.job_manager import get_job_manager
 from src.core.models import (
+    DataSchema,
     JobControlRequest,
     JobSpecification,
+    JobState,
     JobStatus,
-    OutputFormat,
     SchemaExtractionRequest,
+    SchemaExtractionResponse,
     StorageType,
 )
-from src.storage.handlers import get_storage_handler
+from src.storage.handlers import (
+    drop_used_unique_values,
+    get_storage_handler,
+    new_checksum,
+    unique_value_key,
+)
 from src.storage.vector_store import get_vector_store
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+try:
+    import uvloop  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency (ships with uvicorn[standard])
+    uvloop = None
+
 # Initialize MCP server
 app = Server(settings.mcp_server.name)
 
@@ -38,229 +57,298 @@ app = Server(settings.mcp_server.name)
 job_manager = get_job_manager()
 gemini_client = get_gemini_client()
 storage_handler = get_storage_handler()
-
-
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List all available MCP tools."""
-    return [
-        Tool(
-            name="extract_schema",
-            description=(
-                "Extract structured data schema from natural language description. "
-                "Analyzes user requirements and generates a complete schema with field "
-                "types, constraints, and sample values."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_input": {
-                        "type": "string",
-                        "description": "Natural language description of the dataset to generate"
-                    },
-                    "context": {
-                        "type": "object",
-                        "description": "Optional additional context"
-                    },
-                    "example_data": {
-                        "type": "string",
-                        "description": "Optional example data to guide schema extraction"
-                    }
-                },
-                "required": ["user_input"]
-            }
+extraction_cache = get_extraction_cache()
+chunk_cache = get_chunk_cache()
+
+# Status filter lookup for list_jobs; avoids the Enum constructor on every call
+_STATUS_BY_VALUE = {status.value: status for status in JobStatus}
+
+# Values already used for each job's unique fields (keyed by unique_value_key), grown
+# as chunks are stored and rebuilt from the chunk sidecars the first time a job is seen
+# (e.g. after a restart). Entries are dropped once the job finishes, fails or is cancelled.
+_unique_values: dict[UUID, dict[str, dict[Any, Any]]] = {}
+# One lock per job so rebuilding one job's index from disk never blocks other jobs;
+# the global lock only guards the two dicts themselves. A job's lock may be held by a
+# worker thread at any time, so it is kept for the life of the process rather than
+# dropped with the index, and it is only ever taken off the event loop.
+_unique_values_locks: dict[UUID, threading.Lock] = {}
+_unique_values_lock = threading.Lock()
+
+# (job_id, chunk_id) pairs whose store is in progress; only touched on the event loop
+_chunks_in_flight: set[tuple[UUID, int]] = set()
+
+# Optional create_job arguments forwarded only when supplied, so JobSpecification
+# defaults apply instead of explicit None values
+_CREATE_JOB_OPTIONAL_ARGS = ("output_format", "uniqueness_fields", "seed")
+
+
+def _dumps(obj: Any, indent: bool = True) -> str:
+    """Serialize a tool result to JSON; UUIDs and datetimes are encoded natively.
+
+    Indentation is only worth its extra bytes on outputs a human is likely to
+    read, so hot paths that agents parse pass ``indent=False``.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode()
+
+
+# Opt-in pretty-printing for tools whose output is normally compact
+_PRETTY_PROPERTY = {
+    "type": "boolean",
+    "description": "Pretty-print the JSON result (default: compact)"
+}
+
+# Tool definitions are static, so build them once at import time
+_TOOLS: list[Tool] = [
+    Tool(
+        name="extract_schema",
+        description=(
+            "Extract structured data schema from natural language description. "
+            "Analyzes user requirements and generates a complete schema with field "
+            "types, constraints, and sample values."
         ),
-        Tool(
-            name="create_job",
-            description=(
-                "Create a new synthetic data generation job. Takes a validated schema "
-                "and job parameters (row count, format, etc.) and creates a job that "
-                "can be executed in chunks."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "schema": {
-                        "type": "object",
-                        "description": "Data schema (from extract_schema)"
-                    },
-                    "total_rows": {
-                        "type": "integer",
-                        "description": "Total number of rows to generate"
-                    },
-                    "chunk_size": {
-                        "type": "integer",
-                        "description": "Number of rows per chunk (default: 1000)"
-                    },
-                    "output_format": {
-                        "type": "string",
-                        "enum": ["csv", "json", "parquet"],
-                        "description": "Output file format"
-                    },
-                    "uniqueness_fields": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Fields that must have unique values"
-                    },
-                    "seed": {
-                        "type": "integer",
-                        "description": "Random seed for reproducibility"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_input": {
+                    "type": "string",
+                    "description": "Natural language description of the dataset to generate"
                 },
-                "required": ["schema", "total_rows"]
-            }
+                "context": {
+                    "type": "object",
+                    "description": "Optional additional context"
+                },
+                "example_data": {
+                    "type": "string",
+                    "description": "Optional example data to guide schema extraction"
+                },
+                "no_cache": {
+                    "type": "boolean",
+                    "description": "Skip the extraction cache and always call the LLM"
+                }
+            },
+            "required": ["user_input"]
+        }
+    ),
+    Tool(
+        name="create_job",
+        description=(
+            "Create a new synthetic data generation job. Takes a validated schema "
+            "and job parameters (row count, format, etc.) and creates a job that "
+            "can be executed in chunks."
         ),
-        Tool(
-            name="generate_chunk",
-            description=(
-                "Generate a single chunk of synthetic data for a job. This is the core "
-                "generation function that uses the LLM to create realistic data following "
-                "the schema and constraints."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "job_id": {
-                        "type": "string",
-                        "description": "Job ID (UUID)"
-                    },
-                    "chunk_id": {
-                        "type": "integer",
-                        "description": "Chunk number to generate"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "schema": {
+                    "type": "object",
+                    "description": "Data schema (from extract_schema)"
                 },
-                "required": ["job_id", "chunk_id"]
-            }
+                "total_rows": {
+                    "type": "integer",
+                    "description": "Total number of rows to generate"
+                },
+                "chunk_size": {
+                    "type": "integer",
+                    "description": "Number of rows per chunk (default: 1000)"
+                },
+                "output_format": {
+                    "type": "string",
+                    "enum": ["csv", "json", "parquet"],
+                    "description": "Output file format"
+                },
+                "uniqueness_fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Fields that must have unique values"
+                },
+                "seed": {
+                    "type": "integer",
+                    "description": "Random seed for reproducibility"
+                }
+            },
+            "required": ["schema", "total_rows"]
+        }
+    ),
+    Tool(
+        name="generate_chunk",
+        description=(
+            "Generate a single chunk of synthetic data for a job. This is the core "
+            "generation function that uses the LLM to create realistic data following "
+            "the schema and constraints."
         ),
-        Tool(
-            name="get_job_progress",
-            description=(
-                "Get current progress and status of a generation job. Returns detailed "
-                "information about rows generated, chunks completed, status, and estimated "
-                "completion time."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "job_id": {
-                        "type": "string",
-                        "description": "Job ID (UUID)"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job ID (UUID)"
                 },
-                "required": ["job_id"]
-            }
+                "chunk_id": {
+                    "type": "integer",
+                    "description": "Chunk number to generate"
+                },
+                "chunk_ids": {
+                    "type": "array",
+                    "items": {"type": "integer"},
+                    "description": "Chunk numbers to generate concurrently in one call"
+                },
+                "pretty": _PRETTY_PROPERTY
+            },
+            "required": ["job_id"]
+        }
+    ),
+    Tool(
+        name="get_job_progress",
+        description=(
+            "Get current progress and status of a generation job. Returns detailed "
+            "information about rows generated, chunks completed, status, and estimated "
+            "completion time."
         ),
-        Tool(
-            name="control_job",
-            description=(
-                "Control job execution: pause, resume, cancel, or retry. Allows users "
-                "to manage running jobs and handle failures."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "job_id": {
-                        "type": "string",
-                        "description": "Job ID (UUID)"
-                    },
-                    "action": {
-                        "type": "string",
-                        "enum": ["pause", "resume", "cancel", "retry"],
-                        "description": "Control action to perform"
-                    },
-                    "reason": {
-                        "type": "string",
-                        "description": "Optional reason for the action"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job ID (UUID)"
                 },
-                "required": ["job_id", "action"]
-            }
+                "if_version_gt": {
+                    "type": "integer",
+                    "description": (
+                        "Progress version from a previous call; if nothing changed "
+                        "since then, only a small 'unchanged' payload is returned"
+                    )
+                },
+                "pretty": _PRETTY_PROPERTY
+            },
+            "required": ["job_id"]
+        }
+    ),
+    Tool(
+        name="control_job",
+        description=(
+            "Control job execution: pause, resume, cancel, or retry. Allows users "
+            "to manage running jobs and handle failures."
         ),
-        Tool(
-            name="list_jobs",
-            description=(
-                "List all generation jobs with optional status filtering. Useful for "
-                "tracking multiple concurrent jobs."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "status": {
-                        "type": "string",
-                        "enum": ["pending", "schema_validation", "generating", "paused", "completed", "failed", "cancelled"],
-                        "description": "Optional status filter"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of jobs to return (default: 100)"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job ID (UUID)"
+                },
+                "action": {
+                    "type": "string",
+                    "enum": ["pause", "resume", "cancel", "retry"],
+                    "description": "Control action to perform"
+                },
+                "reason": {
+                    "type": "string",
+                    "description": "Optional reason for the action"
                 }
-            }
+            },
+            "required": ["job_id", "action"]
+        }
+    ),
+    Tool(
+        name="list_jobs",
+        description=(
+            "List all generation jobs with optional status filtering. Useful for "
+            "tracking multiple concurrent jobs."
         ),
-        Tool(
-            name="merge_and_download",
-            description=(
-                "Merge all completed chunks into a final dataset file and prepare for "
-                "download. Returns download information including file path and checksum."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "job_id": {
-                        "type": "string",
-                        "description": "Job ID (UUID)"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "status": {
+                    "type": "string",
+                    "enum": ["pending", "schema_validation", "generating", "paused", "completed", "failed", "cancelled"],
+                    "description": "Optional status filter"
                 },
-                "required": ["job_id"]
-            }
-        ),
-        Tool(
-            name="validate_schema",
-            description=(
-                "Validate a schema for correctness and feasibility. Checks for issues "
-                "like invalid constraints, circular dependencies, etc."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "schema": {
-                        "type": "object",
-                        "description": "Schema to validate"
-                    }
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of jobs to return (default: 100)"
                 },
-                "required": ["schema"]
+                "pretty": _PRETTY_PROPERTY
             }
+        }
+    ),
+    Tool(
+        name="merge_and_download",
+        description=(
+            "Merge all completed chunks into a final dataset file and prepare for "
+            "download. Returns download information including file path and checksum."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job ID (UUID)"
+                }
+            },
+            "required": ["job_id"]
+        }
+    ),
+    Tool(
+        name="validate_schema",
+        description=(
+            "Validate a schema for correctness and feasibility. Checks for issues "
+            "like invalid constraints, circular dependencies, etc."
         ),
-    ]
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "schema": {
+                    "type": "object",
+                    "description": "Schema to validate"
+                }
+            },
+            "required": ["schema"]
+        }
+    ),
+]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List all available MCP tools."""
+    return _TOOLS
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent | ImageContent | EmbeddedResource]:
     """Handle tool calls."""
+    handler = _DISPATCH.get(name)
+    if handler is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
+
     try:
-        if name == "extract_schema":
-            return await handle_extract_schema(arguments)
-        elif name == "create_job":
-            return await handle_create_job(arguments)
-        elif name == "generate_chunk":
-            return await handle_generate_chunk(arguments)
-        elif name == "get_job_progress":
-            return await handle_get_job_progress(arguments)
-        elif name == "control_job":
-            return await handle_control_job(arguments)
-        elif name == "list_jobs":
-            return await handle_list_jobs(arguments)
-        elif name == "merge_and_download":
-            return await handle_merge_and_download(arguments)
-        elif name == "validate_schema":
-            return await handle_validate_schema(arguments)
-        else:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+        return await handler(arguments)
     except Exception as e:
-        logger.error(f"Error handling tool {name}: {e}", exc_info=True)
+        # Traceback formatting is costly on flaky LLM failures; only pay for it when debugging
+        logger.error(
+            f"Error handling tool {name}: {e}",
+            exc_info=logger.isEnabledFor(logging.DEBUG)
+        )
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
+def _load_cached_extraction(key: str) -> SchemaExtractionResponse | None:
+    """Load and re-validate a cached extraction, evicting entries that no longer validate."""
+    cached = extraction_cache.get(key)
+    if cached is None:
+        return None
+
+    try:
+        response = SchemaExtractionResponse.model_validate(cached)
+    except ValidationError as e:
+        logger.warning(f"Evicting invalid extraction cache entry: {e}")
+        extraction_cache.evict(key)
+        return None
+
+    logger.info("Schema extraction served from cache")
+    return response
+
+
 async def handle_extract_schema(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle schema extraction from natural language."""
     logger.info("Extracting schema from user input")
@@ -271,21 +359,71 @@ async def handle_extract_schema(arguments: dict[str, Any]) -> list[TextContent]:
         example_data=arguments.get("example_data")
     )
 
-    # Use Gemini to extract schema
-    response = gemini_client.extract_schema(request)
+    use_cache = settings.cache.enabled and not arguments.get("no_cache", False)
+    use_semantic = use_cache and settings.cache.semantic_enabled
+
+    # Everything except the free text must match exactly for any cache hit
+    context_json = ""
+    if request.context:
+        context_json = orjson.dumps(request.context, option=orjson.OPT_SORT_KEYS).decode()
+    scope = extraction_cache.make_key(
+        "gemini",
+        gemini_client.model_name,
+        SCHEMA_PROMPT_VERSION,
+        context_json,
+        request.example_data or ""
+    )
+    cache_key = extraction_cache.make_key(scope, request.user_input)
+
+    response = None
+    if use_cache:
+        response = _load_cached_extraction(cache_key)
 
-    # Format response
+    if response is None and use_semantic:
+        try:
+            matched_key = await asyncio.to_thread(
+                get_semantic_index().lookup, request.user_input, scope
+            )
+        except Exception as e:
+            logger.warning(f"Semantic extraction cache unavailable: {e}")
+            matched_key = None
+        if matched_key:
+            response = _load_cached_extraction(matched_key)
+
+    if response is None:
+        # Use Gemini to extract schema
+        response = await asyncio.to_thread(gemini_client.extract_schema, request)
+        if use_cache:
+            # The extraction already succeeded, so a failed cache write must not fail the tool
+            try:
+                extraction_cache.put(
+                    cache_key,
+                    response.model_dump(mode='json'),
+                    provider="gemini",
+                    model=gemini_client.model_name,
+                    prompt_version=SCHEMA_PROMPT_VERSION
+                )
+            except OSError as e:
+                logger.warning(f"Failed to cache schema extraction: {e}")
+        if use_semantic:
+            try:
+                await asyncio.to_thread(
+                    get_semantic_index().add, request.user_input, scope, cache_key
+                )
+            except Exception as e:
+                logger.warning(f"Failed to index extraction for semantic cache: {e}")
+
+    # Format response; the schema is serialized by pydantic-core and embedded as-is
     result = {
-        "schema": response.schema.model_dump(mode='json'),
+        "schema": orjson.Fragment(response.schema.model_dump_json()),
         "confidence": response.confidence,
         "suggestions": response.suggestions,
         "warnings": response.warnings
     }
 
-    import json
     return [TextContent(
         type="text",
-        text=f"Schema extracted successfully:\n\n{json.dumps(result, indent=2)}"
+        text=f"Schema extracted successfully:\n\n{_dumps(result)}"
     )]
 
 
@@ -293,49 +431,24 @@ async def handle_create_job(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle job creation."""
     logger.info("Creating new data generation job")
 
-    from src.core.models import DataSchema, FieldConstraint, FieldDefinition, FieldType
-
     # Parse schema
-    schema_data = arguments["schema"]
-    fields = []
-    for field_data in schema_data["fields"]:
-        constraints = FieldConstraint(**field_data.get("constraints", {}))
-        field = FieldDefinition(
-            name=field_data["name"],
-            type=FieldType(field_data["type"]),
-            description=field_data.get("description"),
-            constraints=constraints,
-            sample_values=field_data.get("sample_values", []),
-            depends_on=field_data.get("depends_on"),
-            generation_hint=field_data.get("generation_hint")
-        )
-        fields.append(field)
-
-    schema = DataSchema(
-        fields=fields,
-        description=schema_data.get("description"),
-        relationships=schema_data.get("relationships"),
-        metadata=schema_data.get("metadata", {})
-    )
+    schema = DataSchema.model_validate(arguments["schema"])
 
     # Create job specification
     spec = JobSpecification(
         schema=schema,
         total_rows=arguments["total_rows"],
         chunk_size=arguments.get("chunk_size", settings.generation.default_chunk_size),
-        output_format=OutputFormat(arguments.get("output_format", "csv")),
         storage_type=StorageType(settings.storage.type),
-        uniqueness_fields=arguments.get("uniqueness_fields", []),
-        seed=arguments.get("seed")
+        **{key: arguments[key] for key in _CREATE_JOB_OPTIONAL_ARGS if key in arguments}
     )
 
     # Create job
     job_state = job_manager.create_job(spec)
     job_manager.validate_schema(job_state.specification.job_id)
 
-    import json
     result = {
-        "job_id": str(job_state.specification.job_id),
+        "job_id": job_state.specification.job_id,
         "total_rows": spec.total_rows,
         "chunk_size": spec.chunk_size,
         "total_chunks": job_state.progress.total_chunks,
@@ -345,36 +458,144 @@ async def handle_create_job(arguments: dict[str, Any]) -> list[TextContent]:
 
     return [TextContent(
         type="text",
-        text=f"Job created:\n\n{json.dumps(result, indent=2)}"
+        text=f"Job created:\n\n{_dumps(result, indent=False)}"
     )]
 
 
-async def handle_generate_chunk(arguments: dict[str, Any]) -> list[TextContent]:
-    """Handle chunk generation."""
-    job_id = UUID(arguments["job_id"])
-    chunk_id = arguments["chunk_id"]
+def _existing_unique_values(job: JobState) -> dict[str, list[Any]]:
+    """Snapshot the values already used for the job's unique fields."""
+    fields = job.specification.uniqueness_fields
+    if not fields or not job.chunks:
+        return {}
+
+    job_id = job.specification.job_id
+    with _job_unique_values_lock(job_id):
+        index = _unique_values.get(job_id)
+        if index is None:
+            stored = storage_handler.collect_unique_values(
+                chunks=list(job.chunks),
+                fields=fields,
+                format=job.specification.output_format
+            )
+            index = {
+                field: {unique_value_key(value): value for value in stored[field]}
+                for field in fields
+            }
+            with _unique_values_lock:
+                _unique_values[job_id] = index
+        return {field: list(seen.values()) for field, seen in index.items()}
+
+
+def _record_unique_values(job: JobState, data: list[dict[str, Any]]) -> None:
+    """Add a stored chunk's unique-field values to the job's index, if it has one."""
+    job_id = job.specification.job_id
+    with _job_unique_values_lock(job_id):
+        index = _unique_values.get(job_id)
+        if index is None:
+            # Not built yet; the first snapshot reads this chunk from storage
+            return
+        for field, seen in index.items():
+            for row in data:
+                value = row.get(field)
+                if value is not None:
+                    seen.setdefault(unique_value_key(value), value)
+
+
+def _job_unique_values_lock(job_id: UUID) -> threading.Lock:
+    """Get the lock guarding a job's unique-value index."""
+    with _unique_values_lock:
+        return _unique_values_locks.setdefault(job_id, threading.Lock())
+
+
+def _forget_unique_values(job_id: UUID) -> None:
+    """Drop a job's unique-value index once no more chunks will be generated for it.
+
+    Waits for any rebuild of the index in progress, so the rebuilt index is not
+    stored after it was dropped. Blocks, so call it via asyncio.to_thread.
+    """
+    with _job_unique_values_lock(job_id):
+        with _unique_values_lock:
+            _unique_values.pop(job_id, None)
+
+
+def _request_rows(
+    job: JobState,
+    pack: list[tuple[int, int]],
+    attempt: int,
+    rows_needed: int,
+    existing_values: dict[str, list[Any]]
+) -> list[dict[str, Any]]:
+    """Ask Gemini for rows, reusing earlier output for identical seeded requests.
+
+    Only seeded jobs are cached: a seed asks for reproducible data, so retries,
+    re-runs and identical specifications can share the rows of the first call.
+    The key covers every (chunk_id, rows) pair of the request, so a pack never
+    reuses the rows of a different pack that starts at the same chunk.
+    """
+    spec = job.specification
+    cache_key = None
+    if settings.cache.enabled and spec.seed is not None:
+        cache_key = chunk_cache.make_key(
+            "gemini",
+            gemini_client.model_name,
+            DATA_PROMPT_VERSION,
+            spec.schema.model_dump_json(),
+            str(spec.seed),
+            orjson.dumps(pack).decode(),
+            str(attempt),
+            str(rows_needed),
+            orjson.dumps(existing_values, option=orjson.OPT_SORT_KEYS).decode()
+        )
+        cached = chunk_cache.get(cache_key)
+        if cached is not None:
+            rows = cached.get("rows")
+            if isinstance(rows, list) and all(isinstance(row, dict) for row in rows):
+                logger.info(f"Chunks {_pack_label(pack)} of job {spec.job_id} served from cache")
+                return rows
+            logger.warning(f"Evicting invalid chunk cache entry {cache_key}")
+            chunk_cache.evict(cache_key)
+
+    rows = gemini_client.generate_data_chunk(
+        schema=spec.schema,
+        num_rows=rows_needed,
+        existing_values=existing_values if existing_values else None,
+        seed=spec.seed
+    )
 
-    logger.info(f"Generating chunk {chunk_id} for job {job_id}")
+    if cache_key is not None and rows:
+        # The rows are already generated, so a failed cache write must not fail the chunk
+        try:
+            chunk_cache.put(
+                cache_key,
+                {"rows": rows},
+                provider="gemini",
+                model=gemini_client.model_name,
+                prompt_version=DATA_PROMPT_VERSION
+            )
+        except OSError as e:
+            logger.warning(f"Failed to cache generated rows for chunks {_pack_label(pack)}: {e}")
+    return rows
 
-    # Get job
-    job = job_manager.get_job(job_id)
-    if not job:
-        return [TextContent(type="text", text=f"Job {job_id} not found")]
 
-    # Update status if this is the first chunk
-    if job.progress.status == JobStatus.PENDING:
-        job_manager.update_job_status(job_id, JobStatus.GENERATING)
+def _pack_label(pack: list[tuple[int, int]]) -> str:
+    """Name the chunks of a request for log messages."""
+    return ", ".join(str(chunk_id) for chunk_id, _ in pack)
 
-    # Calculate rows for this chunk
-    remaining_rows = job.specification.total_rows - job.progress.rows_generated
-    chunk_rows = min(job.specification.chunk_size, remaining_rows)
 
-    # Collect existing values for uniqueness
-    existing_values = {}
-    if job.specification.uniqueness_fields:
-        for field_name in job.specification.uniqueness_fields:
-            existing_values[field_name] = []
-            # TODO: Collect existing values from previous chunks
+def _generate_chunk_rows(job: JobState, pack: list[tuple[int, int]]) -> list[dict[str, Any]]:
+    """Generate and deduplicate rows for one or more chunks (blocking LLM call).
+
+    Args:
+        job: Job the chunks belong to
+        pack: (chunk_id, rows) pairs generated together in one request
+
+    Returns:
+        Generated rows, possibly fewer than requested after deduplication
+    """
+    job_id = job.specification.job_id
+    chunk_rows = sum(rows for _, rows in pack)
+
+    existing_values = _existing_unique_values(job)
 
     vector_store = None
     if settings.vector_store.enabled:
@@ -383,59 +604,249 @@ async def handle_generate_chunk(arguments: dict[str, Any]) -> list[TextContent]:
         except Exception as exc:
             logger.error("Failed to initialise vector store: %s", exc)
 
-    try:
-        unique_fields = job.specification.uniqueness_fields
-        if vector_store and not unique_fields:
-            unique_fields = [
-                field.name
-                for field in job.specification.schema.fields
-                if field.constraints.unique
-            ]
-
-        max_attempts = settings.vector_store.max_retry_attempts if vector_store else 1
-        attempts = 0
-        deduped_rows: list[dict[str, Any]] = []
-        duplicates_total = 0
-
-        while len(deduped_rows) < chunk_rows and attempts < max_attempts:
-            attempts += 1
-            rows_needed = chunk_rows - len(deduped_rows)
-
-            batch = gemini_client.generate_data_chunk(
-                schema=job.specification.schema,
-                num_rows=rows_needed,
-                existing_values=existing_values if existing_values else None,
-                seed=job.specification.seed
-            )
+    unique_fields = job.specification.uniqueness_fields
+    if vector_store and not unique_fields:
+        unique_fields = [
+            field.name
+            for field in job.specification.schema.fields
+            if field.constraints.unique
+        ]
 
-            if vector_store and batch:
-                batch, duplicates = vector_store.filter_new_rows(
-                    job_id=str(job_id),
-                    rows=batch,
-                    unique_fields=unique_fields,
-                )
-                duplicates_total += len(duplicates)
+    # Exact repeats of unique values are duplicates outright, so they are dropped
+    # with set lookups before any row is embedded for the vector store. The prompt only
+    # carries a bounded summary of used values, so this filter is what enforces uniqueness.
+    exact_seen: dict[str, set[Any]] = {}
+    if unique_fields:
+        exact_seen = {
+            field: {unique_value_key(value) for value in existing_values.get(field, ())}
+            for field in unique_fields
+        }
 
-            deduped_rows.extend(batch)
+    dedup = bool(vector_store or exact_seen)
+    max_attempts = settings.vector_store.max_retry_attempts if dedup else 1
+    attempts = 0
+    deduped_rows: list[dict[str, Any]] = []
+    duplicates_total = 0
 
-            if not batch:
-                logger.debug(
-                    "Job %s: attempt %s yielded no new rows (chunk %s)",
-                    job_id,
-                    attempts,
-                    chunk_id,
-                )
-                if not vector_store:
-                    break
+    while len(deduped_rows) < chunk_rows and attempts < max_attempts:
+        attempts += 1
+        rows_needed = chunk_rows - len(deduped_rows)
+
+        batch = _request_rows(job, pack, attempts, rows_needed, existing_values)
 
-        data = deduped_rows
+        if exact_seen and batch:
+            candidates = drop_used_unique_values(batch, exact_seen)
+            duplicates_total += len(batch) - len(candidates)
+            batch = candidates
+
+        if vector_store and batch:
+            batch, duplicates = vector_store.filter_new_rows(
+                job_id=str(job_id),
+                rows=batch,
+                unique_fields=unique_fields,
+            )
+            duplicates_total += len(duplicates)
 
-        if vector_store and duplicates_total:
-            logger.info(
-                "Job %s: removed %s duplicate rows before storage",
+        deduped_rows.extend(batch)
+
+        if not batch:
+            logger.debug(
+                "Job %s: attempt %s yielded no new rows (chunks %s)",
                 job_id,
-                duplicates_total,
+                attempts,
+                _pack_label(pack),
             )
+            if not dedup:
+                break
+
+    if duplicates_total:
+        logger.info(
+            "Job %s: removed %s duplicate rows before storage",
+            job_id,
+            duplicates_total,
+        )
+
+    return deduped_rows
+
+
+async def _store_chunk_rows(job: JobState, chunk_id: int, data: list[dict[str, Any]]) -> bool:
+    """Persist a generated chunk and advance the job's progress.
+
+    Returns:
+        False if the chunk was already stored (or is being stored) by a concurrent call
+    """
+    # Claimed on the event loop before the first await, so two calls that both passed the
+    # has_chunk check before generating cannot both store the chunk
+    key = (job.specification.job_id, chunk_id)
+    if job.has_chunk(chunk_id) or key in _chunks_in_flight:
+        logger.info("Job %s: dropping duplicate chunk %s", key[0], chunk_id)
+        return False
+    _chunks_in_flight.add(key)
+
+    try:
+        # Chunk files are independent, so the write can run in a worker thread
+        metadata = await asyncio.to_thread(
+            storage_handler.store_chunk,
+            job_id=job.specification.job_id,
+            chunk_id=chunk_id,
+            data=data,
+            format=job.specification.output_format,
+            unique_fields=job.specification.uniqueness_fields
+        )
+
+        # Job state is only mutated here on the event loop, so concurrent chunks need no lock
+        progress = job_manager.add_chunk(job.specification.job_id, metadata)
+    finally:
+        _chunks_in_flight.discard(key)
+    if job.specification.uniqueness_fields:
+        # Waits on the job's lock, which a worker may hold while rebuilding the index
+        await asyncio.to_thread(_record_unique_values, job, data)
+
+    # Check if job is complete
+    if progress and progress.chunks_completed >= progress.total_chunks:
+        job_manager.update_job_status(job.specification.job_id, JobStatus.COMPLETED)
+        await asyncio.to_thread(_forget_unique_values, job.specification.job_id)
+    return True
+
+
+def _job_progress_summary(job: JobState) -> dict[str, Any]:
+    """Summarize job progress for chunk generation results."""
+    return {
+        "chunks_completed": job.progress.chunks_completed,
+        "total_chunks": job.progress.total_chunks,
+        "rows_generated": job.progress.rows_generated,
+        "total_rows": job.specification.total_rows,
+        "progress_percentage": job.progress.progress_percentage,
+        "status": job.progress.status.value
+    }
+
+
+async def _generate_chunk_batch(
+    job: JobState,
+    chunk_ids: list[int],
+    pretty: bool = False
+) -> list[TextContent]:
+    """Generate several chunks concurrently and report one aggregated result."""
+    # Allocate rows up front so concurrent chunks never overshoot total_rows
+    remaining_rows = job.specification.total_rows - job.progress.rows_generated
+    allocations: list[tuple[int, int]] = []
+    issues: list[str] = []
+    # dict.fromkeys drops repeated ids, which has_chunk cannot see until they are stored
+    for chunk_id in dict.fromkeys(chunk_ids):
+        if job.has_chunk(chunk_id):
+            issues.append(f"Chunk {chunk_id}: skipped, already generated")
+            continue
+        chunk_rows = min(job.specification.chunk_size, remaining_rows)
+        if chunk_rows <= 0:
+            issues.append(f"Chunk {chunk_id}: skipped, job already has all requested rows")
+            continue
+        allocations.append((chunk_id, chunk_rows))
+        remaining_rows -= chunk_rows
+
+    # Pack consecutive small chunks into one Gemini request to amortize per-call overhead
+    max_rows = settings.generation.max_rows_per_request
+    packs: list[list[tuple[int, int]]] = []
+    for chunk_id, chunk_rows in allocations:
+        if packs and sum(rows for _, rows in packs[-1]) + chunk_rows <= max_rows:
+            packs[-1].append((chunk_id, chunk_rows))
+        else:
+            packs.append([(chunk_id, chunk_rows)])
+
+    # Each pack snapshots the job's used unique values before generating, so concurrent
+    # packs could repeat each other's values; jobs with unique fields run packs one at a
+    # time, storing each before the next one takes its snapshot
+    if job.specification.uniqueness_fields:
+        semaphore = asyncio.Semaphore(1)
+    else:
+        semaphore = asyncio.Semaphore(settings.generation.max_concurrent_chunks)
+
+    async def run_pack(pack: list[tuple[int, int]]) -> list[dict[str, Any]]:
+        async with semaphore:
+            data = await asyncio.to_thread(_generate_chunk_rows, job, pack)
+
+            outcomes = []
+            offset = 0
+            for chunk_id, chunk_rows in pack:
+                chunk_data = data[offset:offset + chunk_rows]
+                offset += chunk_rows
+                if not chunk_data:
+                    logger.warning(
+                        "Job %s: chunk %s produced no new rows after deduplication",
+                        job.specification.job_id,
+                        chunk_id,
+                    )
+                    issues.append(f"Chunk {chunk_id}: no new rows generated after deduplication")
+                elif not await _store_chunk_rows(job, chunk_id, chunk_data):
+                    issues.append(f"Chunk {chunk_id}: skipped, already generated")
+                    chunk_data = []
+                outcomes.append({"chunk_id": chunk_id, "rows_generated": len(chunk_data)})
+            return outcomes
+
+    results = await asyncio.gather(*(run_pack(pack) for pack in packs), return_exceptions=True)
+
+    chunks = []
+    errors = []
+    for pack, outcome in zip(packs, results):
+        if isinstance(outcome, Exception):
+            for chunk_id, _ in pack:
+                logger.error(f"Error generating chunk {chunk_id}: {outcome}")
+                errors.append(f"Chunk {chunk_id}: {outcome}")
+        else:
+            chunks.extend(outcome)
+
+    if errors:
+        job_manager.update_job_status(job.specification.job_id, JobStatus.FAILED, "; ".join(errors))
+        await asyncio.to_thread(_forget_unique_values, job.specification.job_id)
+
+    result = {
+        "chunk_ids": chunk_ids,
+        "rows_generated": sum(chunk["rows_generated"] for chunk in chunks),
+        "chunks": chunks,
+        "issues": issues + errors,
+        "job_progress": _job_progress_summary(job)
+    }
+
+    return [TextContent(
+        type="text",
+        text=f"Chunks generated:\n\n{_dumps(result, indent=pretty)}"
+    )]
+
+
+async def handle_generate_chunk(arguments: dict[str, Any]) -> list[TextContent]:
+    """Handle chunk generation for a single chunk or a batch of chunks."""
+    job_id = UUID(arguments["job_id"])
+    chunk_ids = arguments.get("chunk_ids")
+    chunk_id = arguments.get("chunk_id")
+
+    if chunk_ids is None and chunk_id is None:
+        return [TextContent(type="text", text="Either chunk_id or chunk_ids is required")]
+
+    logger.info(f"Generating chunk(s) {chunk_ids or chunk_id} for job {job_id}")
+
+    # Get job
+    job = job_manager.get_job(job_id)
+    if not job:
+        return [TextContent(type="text", text=f"Job {job_id} not found")]
+
+    # Update status if this is the first chunk
+    if job.progress.status == JobStatus.PENDING:
+        job_manager.update_job_status(job_id, JobStatus.GENERATING)
+
+    if chunk_ids is not None:
+        return await _generate_chunk_batch(job, chunk_ids, pretty=arguments.get("pretty", False))
+
+    if job.has_chunk(chunk_id):
+        return [TextContent(
+            type="text",
+            text=f"Chunk {chunk_id} of job {job_id} already generated"
+        )]
+
+    # Calculate rows for this chunk
+    remaining_rows = job.specification.total_rows - job.progress.rows_generated
+    chunk_rows = min(job.specification.chunk_size, remaining_rows)
+
+    try:
+        data = await asyncio.to_thread(_generate_chunk_rows, job, [(chunk_id, chunk_rows)])
 
         if not data:
             logger.warning(
@@ -451,43 +862,30 @@ async def handle_generate_chunk(arguments: dict[str, Any]) -> list[TextContent]:
                 ),
             )]
 
-        # Store chunk
-        metadata = storage_handler.store_chunk(
-            job_id=job_id,
-            chunk_id=chunk_id,
-            data=data,
-            format=job.specification.output_format
-        )
-
-        # Update job progress
-        job_manager.add_chunk(job_id, metadata)
-
-        # Check if job is complete
-        if job.progress.chunks_completed >= job.progress.total_chunks:
-            job_manager.update_job_status(job_id, JobStatus.COMPLETED)
+        if not await _store_chunk_rows(job, chunk_id, data):
+            return [TextContent(
+                type="text",
+                text=f"Chunk {chunk_id} of job {job_id} already generated"
+            )]
 
-        import json
         result = {
             "chunk_id": chunk_id,
             "rows_generated": len(data),
-            "job_progress": {
-                "chunks_completed": job.progress.chunks_completed,
-                "total_chunks": job.progress.total_chunks,
-                "rows_generated": job.progress.rows_generated,
-                "total_rows": job.specification.total_rows,
-                "progress_percentage": job.progress.progress_percentage,
-                "status": job.progress.status.value
-            }
+            "job_progress": _job_progress_summary(job)
         }
 
         return [TextContent(
             type="text",
-            text=f"Chunk generated:\n\n{json.dumps(result, indent=2)}"
+            text=f"Chunk generated:\n\n{_dumps(result, indent=arguments.get('pretty', False))}"
         )]
 
     except Exception as e:
-        logger.error(f"Error generating chunk: {e}")
+        logger.error(
+            f"Error generating chunk: {e}",
+            exc_info=logger.isEnabledFor(logging.DEBUG)
+        )
         job_manager.update_job_status(job_id, JobStatus.FAILED, str(e))
+        await asyncio.to_thread(_forget_unique_values, job_id)
         return [TextContent(type="text", text=f"Error generating chunk: {str(e)}")]
 
 
@@ -499,23 +897,31 @@ async def handle_get_job_progress(arguments: dict[str, Any]) -> list[TextContent
     if not job:
         return [TextContent(type="text", text=f"Job {job_id} not found")]
 
-    import json
+    # Cheap path for pollers: nothing changed since the version they last saw
+    known_version = arguments.get("if_version_gt")
+    if known_version is not None and job.progress.version <= known_version:
+        return [TextContent(
+            type="text",
+            text=_dumps({"unchanged": True, "version": job.progress.version}, indent=False)
+        )]
+
     result = {
-        "job_id": str(job_id),
+        "job_id": job_id,
+        "version": job.progress.version,
         "status": job.progress.status.value,
         "rows_generated": job.progress.rows_generated,
         "total_rows": job.specification.total_rows,
         "chunks_completed": job.progress.chunks_completed,
         "total_chunks": job.progress.total_chunks,
         "progress_percentage": job.progress.progress_percentage,
-        "started_at": str(job.progress.started_at) if job.progress.started_at else None,
-        "completed_at": str(job.progress.completed_at) if job.progress.completed_at else None,
+        "started_at": job.progress.started_at,
+        "completed_at": job.progress.completed_at,
         "error_message": job.progress.error_message
     }
 
     return [TextContent(
         type="text",
-        text=f"Job progress:\n\n{json.dumps(result, indent=2)}"
+        text=f"Job progress:\n\n{_dumps(result, indent=arguments.get('pretty', False))}"
     )]
 
 
@@ -534,6 +940,8 @@ async def handle_control_job(arguments: dict[str, Any]) -> list[TextContent]:
     success = job_manager.control_job(request)
 
     if success:
+        if action == "cancel":
+            await asyncio.to_thread(_forget_unique_values, job_id)
         return [TextContent(
             type="text",
             text=f"Job {job_id} {action} successful"
@@ -548,33 +956,57 @@ async def handle_control_job(arguments: dict[str, Any]) -> list[TextContent]:
 async def handle_list_jobs(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle job listing."""
     status_str = arguments.get("status")
-    status = JobStatus(status_str) if status_str else None
+    status = None
+    if status_str:
+        status = _STATUS_BY_VALUE.get(status_str)
+        if status is None:
+            return [TextContent(
+                type="text",
+                text=f"Invalid status {status_str!r}, expected one of: "
+                     f"{', '.join(_STATUS_BY_VALUE)}"
+            )]
     limit = arguments.get("limit", 100)
 
     jobs = job_manager.list_jobs(status=status, limit=limit)
 
-    import json
     result = {
         "total": len(jobs),
-        "jobs": [
-            {
-                "job_id": str(job.specification.job_id),
-                "status": job.progress.status.value,
-                "total_rows": job.specification.total_rows,
-                "rows_generated": job.progress.rows_generated,
-                "progress_percentage": job.progress.progress_percentage,
-                "created_at": str(job.specification.created_at)
-            }
-            for job in jobs
-        ]
+        "jobs": [job.list_view() for job in jobs]
     }
 
     return [TextContent(
         type="text",
-        text=f"Jobs:\n\n{json.dumps(result, indent=2)}"
+        text=f"Jobs:\n\n{_dumps(result, indent=arguments.get('pretty', False))}"
     )]
 
 
+def _merge_dataset(job: JobState) -> tuple[Path, int, str]:
+    """Merge a job's chunks into the output file (blocking disk I/O).
+
+    Args:
+        job: Completed job whose chunks should be merged
+
+    Returns:
+        Tuple of merged file path, file size in bytes and checksum
+    """
+    job_id = job.specification.job_id
+    output_path = settings.storage.output_path / f"{job_id}.{job.specification.output_format.value}"
+    # Hash the output as it is written so the merged file is never read back
+    digest = new_checksum()
+    merged_path = storage_handler.merge_chunks(
+        job_id=job_id,
+        chunks=job.chunks,
+        output_path=output_path,
+        format=job.specification.output_format,
+        digest=digest
+    )
+
+    file_size = merged_path.stat().st_size
+    checksum = digest.hexdigest()
+
+    return merged_path, file_size, checksum
+
+
 async def handle_merge_and_download(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle dataset merging and download preparation."""
     job_id = UUID(arguments["job_id"])
@@ -589,25 +1021,11 @@ async def handle_merge_and_download(arguments: dict[str, Any]) -> list[TextConte
             text=f"Job {job_id} is not completed yet (status: {job.progress.status.value})"
         )]
 
-    # Merge chunks
-    output_path = settings.storage.output_path / f"{job_id}.{job.specification.output_format.value}"
-    merged_path = storage_handler.merge_chunks(
-        job_id=job_id,
-        chunks=job.chunks,
-        output_path=output_path,
-        format=job.specification.output_format
-    )
-
-    # Calculate file size and checksum
-    import hashlib
-    file_size = merged_path.stat().st_size
-
-    with open(merged_path, 'rb') as f:
-        checksum = hashlib.sha256(f.read()).hexdigest()
+    # Merging and checksumming are disk-bound, so keep them off the event loop
+    merged_path, file_size, checksum = await asyncio.to_thread(_merge_dataset, job)
 
-    import json
     result = {
-        "job_id": str(job_id),
+        "job_id": job_id,
         "file_path": str(merged_path),
         "file_size_bytes": file_size,
         "file_size_mb": round(file_size / (1024 * 1024), 2),
@@ -619,42 +1037,18 @@ async def handle_merge_and_download(arguments: dict[str, Any]) -> list[TextConte
 
     return [TextContent(
         type="text",
-        text=f"Dataset merged:\n\n{json.dumps(result, indent=2)}"
+        text=f"Dataset merged:\n\n{_dumps(result)}"
     )]
 
 
 async def handle_validate_schema(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle schema validation."""
-    from src.core.models import DataSchema, FieldConstraint, FieldDefinition, FieldType
-
-    schema_data = arguments["schema"]
-
     # Parse schema
-    fields = []
-    for field_data in schema_data["fields"]:
-        constraints = FieldConstraint(**field_data.get("constraints", {}))
-        field = FieldDefinition(
-            name=field_data["name"],
-            type=FieldType(field_data["type"]),
-            description=field_data.get("description"),
-            constraints=constraints,
-            sample_values=field_data.get("sample_values", []),
-            depends_on=field_data.get("depends_on"),
-            generation_hint=field_data.get("generation_hint")
-        )
-        fields.append(field)
-
-    schema = DataSchema(
-        fields=fields,
-        description=schema_data.get("description"),
-        relationships=schema_data.get("relationships"),
-        metadata=schema_data.get("metadata", {})
-    )
+    schema = DataSchema.model_validate(arguments["schema"])
 
     # Validate
     issues = schema.validate_constraints()
 
-    import json
     if issues:
         result = {
             "valid": False,
@@ -669,13 +1063,29 @@ async def handle_validate_schema(arguments: dict[str, Any]) -> list[TextContent]
 
     return [TextContent(
         type="text",
-        text=f"Schema validation:\n\n{json.dumps(result, indent=2)}"
+        text=f"Schema validation:\n\n{_dumps(result)}"
     )]
 
 
+# Tool name -> handler lookup used by call_tool
+_DISPATCH = {
+    "extract_schema": handle_extract_schema,
+    "create_job": handle_create_job,
+    "generate_chunk": handle_generate_chunk,
+    "get_job_progress": handle_get_job_progress,
+    "control_job": handle_control_job,
+    "list_jobs": handle_list_jobs,
+    "merge_and_download": handle_merge_and_download,
+    "validate_schema": handle_validate_schema,
+}
+
+
 def main():
     """Run the MCP server."""
     import mcp
+    if uvloop is not None:
+        # libuv-backed loop keeps scheduling overhead low for concurrent chunk generation
+        uvloop.install()
     logger.info(f"Starting MCP server: {settings.mcp_server.name}")
     mcp.server.stdio.stdio_server()(app)
 
@@ -2,18 +2,196 @@
 
 import csv
 import hashlib
-import json
+import io
+import os
+import shutil
+import sys
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 from uuid import UUID
 
+import orjson
+
 from src.config import settings
 from src.core.models import ChunkMetadata, OutputFormat
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+try:
+    import google_crc32c  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency (crc32c extra)
+    google_crc32c = None
+
+# Read size used when streaming chunk files into merged output
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Copy file-to-file in the kernel where sendfile supports it (as shutil does)
+_USE_SENDFILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+# ZSTD with dictionary encoding: smaller files than the default Snappy for the
+# repetitive values synthetic data tends to have
+_PARQUET_WRITE_OPTIONS = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "use_dictionary": True,
+    "write_statistics": True,
+}
+
+
+class _Crc32cChecksum:
+    """CRC32C digest whose hex form is prefixed with the algorithm name."""
+
+    def __init__(self):
+        self._checksum = google_crc32c.Checksum()
+
+    def update(self, data: bytes):
+        # google_crc32c only accepts read-only buffers, not the memoryviews writers pass
+        self._checksum.update(bytes(data))
+
+    def hexdigest(self) -> str:
+        return "crc32c:" + self._checksum.hexdigest().decode("ascii")
+
+
+def new_checksum() -> Any:
+    """Create a digest for the configured checksum algorithm.
+
+    SHA-256 checksums are plain hex for compatibility; CRC32C checksums are
+    prefixed with ``crc32c:`` so clients know which algorithm to verify.
+
+    Returns:
+        Object with ``update(bytes)`` and ``hexdigest()`` like a hashlib digest
+    """
+    if settings.storage.checksum_algorithm == "crc32c":
+        if google_crc32c is not None:
+            return _Crc32cChecksum()
+        logger.warning(
+            "CRC32C checksums requested but 'google-crc32c' is not installed, using SHA-256"
+        )
+    return hashlib.sha256()
+
+
+class _HashingWriter(io.RawIOBase):
+    """Binary writer that feeds every byte it writes into a hash digest."""
+
+    def __init__(self, raw: io.RawIOBase, digest: Any):
+        self._raw = raw
+        self._digest = digest
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        written = self._raw.write(data)
+        self._digest.update(memoryview(data)[:written])
+        return written
+
+    def tell(self) -> int:
+        return self._raw.tell()
+
+    def close(self):
+        if not self.closed:
+            self._raw.close()
+        super().close()
+
+
+def _open_output(path: Path, digest: Any | None = None) -> io.BufferedWriter:
+    """Open a merged output file for binary writing, hashing its bytes if a digest is given."""
+    if digest is None:
+        return open(path, 'wb', buffering=_COPY_BUFFER_SIZE)
+    raw = _HashingWriter(open(path, 'wb', buffering=0), digest)
+    return io.BufferedWriter(raw, _COPY_BUFFER_SIZE)
+
+
+def unique_value_key(value: Any) -> Any:
+    """Get a hashable key for deduplicating a unique-field value.
+
+    Scalars are their own key. Lists and objects (ARRAY and JSON fields) are
+    keyed by their canonical JSON, so equal values collide regardless of key order.
+
+    Args:
+        value: Field value
+
+    Returns:
+        Value itself if hashable, otherwise its canonical JSON bytes
+    """
+    try:
+        hash(value)
+    except TypeError:
+        return orjson.dumps(value, default=str, option=orjson.OPT_SORT_KEYS)
+    return value
+
+
+def drop_used_unique_values(
+    rows: list[dict[str, Any]],
+    seen: dict[str, set[Any]]
+) -> list[dict[str, Any]]:
+    """Drop rows that repeat an already used value of any unique field.
+
+    Args:
+        rows: Generated rows
+        seen: unique_value_key keys of used values per unique field; updated with
+            the values of kept rows, so repeats within ``rows`` are dropped as well
+
+    Returns:
+        Rows whose unique-field values are all new
+    """
+    kept = []
+    for row in rows:
+        keys = {
+            field: unique_value_key(row[field])
+            for field in seen
+            if row.get(field) is not None
+        }
+        if any(key in seen[field] for field, key in keys.items()):
+            continue
+        for field, key in keys.items():
+            seen[field].add(key)
+        kept.append(row)
+    return kept
+
+
+def _add_distinct(seen: dict[Any, Any], values: Iterable[Any]):
+    """Add values to a dedup-key -> value mapping, keeping the first occurrence."""
+    for value in values:
+        seen.setdefault(unique_value_key(value), value)
+
+
+def rows_to_table(data: list[dict[str, Any]]) -> Any:
+    """Build an Arrow table with a column for every key found in any row.
+
+    ``pa.Table.from_pylist`` takes its columns from the first row only, which
+    would silently drop fields the LLM left out of that row.
+    """
+    import pyarrow as pa
+
+    names = list(dict.fromkeys(key for row in data for key in row))
+    return pa.table({name: [row.get(name) for row in data] for name in names})
+
+
+def _copy_remaining(infile: io.BufferedReader, outfile: io.BufferedWriter):
+    """Copy the rest of infile to outfile, in the kernel when no digest needs the bytes."""
+    # Only Linux sendfile accepts a regular file as destination; BSD/macOS need a socket
+    if _USE_SENDFILE and isinstance(outfile.raw, io.FileIO):
+        outfile.flush()
+        offset = infile.tell()
+        remaining = os.fstat(infile.fileno()).st_size - offset
+        try:
+            while remaining > 0:
+                sent = os.sendfile(outfile.fileno(), infile.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+            return
+        except OSError as e:
+            logger.debug("sendfile failed (%s), copying the rest in user space", e)
+            # sendfile leaves infile's position alone, so resume from the bytes sent so far
+            infile.seek(offset)
+    shutil.copyfileobj(infile, outfile, _COPY_BUFFER_SIZE)
+
 
 class StorageHandler(ABC):
     """Abstract base class for storage handlers."""
@@ -24,7 +202,8 @@ class StorageHandler(ABC):
         job_id: UUID,
         chunk_id: int,
         data: list[dict[str, Any]],
-        format: OutputFormat
+        format: OutputFormat,
+        unique_fields: list[str] | None = None
     ) -> ChunkMetadata:
         """Store a data chunk.
         
@@ -33,6 +212,7 @@ class StorageHandler(ABC):
             chunk_id: Chunk identifier
             data: Chunk data
             format: Output format
+            unique_fields: Fields whose values should be summarized for uniqueness checks
             
         Returns:
             Chunk metadata
@@ -62,7 +242,8 @@ class StorageHandler(ABC):
         job_id: UUID,
         chunks: list[ChunkMetadata],
         output_path: Path,
-        format: OutputFormat
+        format: OutputFormat,
+        digest: Any | None = None
     ) -> Path:
         """Merge multiple chunks into a single file.
         
@@ -71,6 +252,8 @@ class StorageHandler(ABC):
             chunks: List of chunk metadata
             output_path: Output file path
             format: Output format
+            digest: Optional digest (see new_checksum) fed every byte written, so callers
+                get a checksum without re-reading the merged file
             
         Returns:
             Path to merged file
@@ -95,6 +278,29 @@ class StorageHandler(ABC):
         """
         pass
 
+    def collect_unique_values(
+        self,
+        chunks: list[ChunkMetadata],
+        fields: list[str],
+        format: OutputFormat
+    ) -> dict[str, list[Any]]:
+        """Collect values already used for unique fields across stored chunks.
+
+        Args:
+            chunks: Chunks stored so far
+            fields: Unique field names
+            format: Output format
+
+        Returns:
+            Distinct values per field, in generation order
+        """
+        values: dict[str, dict[Any, Any]] = {field: {} for field in fields}
+        for chunk in chunks:
+            data = self.retrieve_chunk(chunk, format)
+            for field, seen in values.items():
+                _add_distinct(seen, (row[field] for row in data if row.get(field) is not None))
+        return {field: list(seen.values()) for field, seen in values.items()}
+
 
 class DiskStorageHandler(StorageHandler):
     """Disk-based storage handler."""
@@ -107,14 +313,15 @@ class DiskStorageHandler(StorageHandler):
         """
         self.base_path = base_path or settings.storage.temp_path
         self.base_path.mkdir(parents=True, exist_ok=True)
-        logger.info(f"Initialized DiskStorageHandler at {self.base_path}")
+        logger.info("Initialized DiskStorageHandler at %s", self.base_path)
 
     def store_chunk(
         self,
         job_id: UUID,
         chunk_id: int,
         data: list[dict[str, Any]],
-        format: OutputFormat
+        format: OutputFormat,
+        unique_fields: list[str] | None = None
     ) -> ChunkMetadata:
         """Store chunk to disk."""
         # Create job directory
@@ -125,17 +332,21 @@ class DiskStorageHandler(StorageHandler):
         ext = self._get_extension(format)
         file_path = job_dir / f"chunk_{chunk_id:06d}.{ext}"
 
-        # Write data
+        # Write data, hashing the bytes on their way out instead of re-reading the file
+        digest = new_checksum()
         if format == OutputFormat.CSV:
-            self._write_csv(file_path, data)
+            size_bytes = self._write_csv(file_path, data, digest)
         elif format == OutputFormat.JSON:
-            self._write_json(file_path, data)
+            size_bytes = self._write_json(file_path, data, digest)
         elif format == OutputFormat.PARQUET:
-            self._write_parquet(file_path, data)
+            size_bytes = self._write_parquet(file_path, data, digest)
+        else:
+            raise ValueError(f"Unsupported format: {format}")
+        checksum = digest.hexdigest()
 
-        # Calculate checksum and size
-        checksum = self._calculate_checksum(file_path)
-        size_bytes = file_path.stat().st_size
+        # Small sidecar of unique-field values so later chunks never re-read this data
+        if unique_fields:
+            self._write_unique_values(file_path, data, unique_fields)
 
         metadata = ChunkMetadata(
             chunk_id=chunk_id,
@@ -146,7 +357,7 @@ class DiskStorageHandler(StorageHandler):
             size_bytes=size_bytes
         )
 
-        logger.debug(f"Stored chunk {chunk_id} at {file_path} ({size_bytes} bytes)")
+        logger.debug("Stored chunk %s at %s (%s bytes)", chunk_id, file_path, size_bytes)
         return metadata
 
     def retrieve_chunk(
@@ -174,7 +385,8 @@ class DiskStorageHandler(StorageHandler):
         job_id: UUID,
         chunks: list[ChunkMetadata],
         output_path: Path,
-        format: OutputFormat
+        format: OutputFormat,
+        digest: Any | None = None
     ) -> Path:
         """Merge chunks into single file."""
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -183,32 +395,55 @@ class DiskStorageHandler(StorageHandler):
         chunks = sorted(chunks, key=lambda c: c.chunk_id)
 
         if format == OutputFormat.CSV:
-            self._merge_csv(chunks, output_path)
+            self._merge_csv(chunks, output_path, digest)
         elif format == OutputFormat.JSON:
-            self._merge_json(chunks, output_path)
+            self._merge_json(chunks, output_path, digest)
         elif format == OutputFormat.PARQUET:
-            self._merge_parquet(chunks, output_path)
+            self._merge_parquet(chunks, output_path, digest)
         else:
             raise ValueError(f"Unsupported format: {format}")
 
-        logger.info(f"Merged {len(chunks)} chunks to {output_path}")
+        logger.info("Merged %s chunks to %s", len(chunks), output_path)
         return output_path
 
+    def collect_unique_values(
+        self,
+        chunks: list[ChunkMetadata],
+        fields: list[str],
+        format: OutputFormat
+    ) -> dict[str, list[Any]]:
+        """Collect unique-field values from chunk sidecars, reading chunks only without one."""
+        values: dict[str, dict[Any, Any]] = {field: {} for field in fields}
+        for chunk in chunks:
+            sidecar_path = self._unique_values_path(Path(chunk.storage_location))
+            if sidecar_path.exists():
+                chunk_values = orjson.loads(sidecar_path.read_bytes())
+                for field, seen in values.items():
+                    _add_distinct(seen, chunk_values.get(field, []))
+            elif format == OutputFormat.PARQUET:
+                chunk_values = self._read_parquet_columns(Path(chunk.storage_location), fields)
+                for field, column in chunk_values.items():
+                    _add_distinct(values[field], column)
+            else:
+                data = self.retrieve_chunk(chunk, format)
+                for field, seen in values.items():
+                    _add_distinct(seen, (row[field] for row in data if row.get(field) is not None))
+        return {field: list(seen.values()) for field, seen in values.items()}
+
     def delete_chunk(self, metadata: ChunkMetadata):
         """Delete chunk file."""
         file_path = Path(metadata.storage_location)
         if file_path.exists():
             file_path.unlink()
-            logger.debug(f"Deleted chunk {metadata.chunk_id}")
+            self._unique_values_path(file_path).unlink(missing_ok=True)
+            logger.debug("Deleted chunk %s", metadata.chunk_id)
 
     def cleanup_job(self, job_id: UUID):
         """Clean up all job files."""
         job_dir = self.base_path / str(job_id)
         if job_dir.exists():
-            for file in job_dir.glob("*"):
-                file.unlink()
-            job_dir.rmdir()
-            logger.info(f"Cleaned up job {job_id} storage")
+            shutil.rmtree(job_dir, ignore_errors=True)
+            logger.info("Cleaned up job %s storage", job_id)
 
     def _get_extension(self, format: OutputFormat) -> str:
         """Get file extension for format."""
@@ -218,97 +453,208 @@ class DiskStorageHandler(StorageHandler):
             OutputFormat.PARQUET: "parquet"
         }[format]
 
-    def _write_csv(self, path: Path, data: list[dict[str, Any]]):
-        """Write data to CSV file."""
-        if not data:
-            return
+    def _unique_values_path(self, chunk_path: Path) -> Path:
+        """Get the unique-values sidecar path for a chunk file."""
+        return chunk_path.with_suffix(".uniq.json")
+
+    def _write_unique_values(self, chunk_path: Path, data: list[dict[str, Any]], fields: list[str]):
+        """Write distinct values of unique fields next to the chunk file."""
+        values = {}
+        for field in fields:
+            seen: dict[Any, Any] = {}
+            _add_distinct(seen, (row[field] for row in data if row.get(field) is not None))
+            values[field] = list(seen.values())
+        self._unique_values_path(chunk_path).write_bytes(orjson.dumps(values, default=str))
 
-        with open(path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=data[0].keys())
-            writer.writeheader()
-            writer.writerows(data)
+    def _write_csv(
+        self,
+        path: Path,
+        data: list[dict[str, Any]],
+        digest: Any | None = None
+    ) -> int:
+        """Write data to CSV file, returning its size in bytes."""
+        with io.TextIOWrapper(_open_output(path, digest), encoding='utf-8', newline='') as f:
+            if data:
+                writer = csv.DictWriter(f, fieldnames=data[0].keys())
+                writer.writeheader()
+                writer.writerows(data)
+            f.flush()
+            return f.buffer.tell()
 
     def _read_csv(self, path: Path) -> list[dict[str, Any]]:
-        """Read data from CSV file."""
-        with open(path, encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            return list(reader)
+        """Read data from CSV file, with every value as a string like csv.DictReader."""
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+        except ImportError:
+            with open(path, encoding='utf-8') as f:
+                return list(csv.DictReader(f))
+
+        with open(path, encoding='utf-8', newline='') as f:
+            header = next(csv.reader(f), None)
+        if not header:
+            return []
+
+        # Parsed by Arrow's C++ reader; columns are pinned to strings so values and
+        # empty cells come back exactly as csv.DictReader would return them
+        table = pacsv.read_csv(
+            path,
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in header},
+                strings_can_be_null=False,
+                quoted_strings_can_be_null=False
+            )
+        )
+        return table.to_pylist()
 
-    def _write_json(self, path: Path, data: list[dict[str, Any]]):
-        """Write data to JSON file."""
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
+    def _write_json(
+        self,
+        path: Path,
+        data: list[dict[str, Any]],
+        digest: Any | None = None
+    ) -> int:
+        """Write data to JSON file, returning its size in bytes."""
+        payload = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2)
+        if digest is not None:
+            digest.update(payload)
+        path.write_bytes(payload)
+        return len(payload)
 
     def _read_json(self, path: Path) -> list[dict[str, Any]]:
         """Read data from JSON file."""
-        with open(path, encoding='utf-8') as f:
-            return json.load(f)
+        return orjson.loads(path.read_bytes())
 
-    def _write_parquet(self, path: Path, data: list[dict[str, Any]]):
-        """Write data to Parquet file."""
+    def _write_parquet(
+        self,
+        path: Path,
+        data: list[dict[str, Any]],
+        digest: Any | None = None
+    ) -> int:
+        """Write data to Parquet file, returning its size in bytes."""
         try:
-            import pandas as pd
-            df = pd.DataFrame(data)
-            df.to_parquet(path, index=False)
+            import pyarrow.parquet as pq
         except ImportError:
-            raise ImportError("pandas and pyarrow are required for Parquet support")
+            raise ImportError("pyarrow is required for Parquet support")
+        # Built straight from the rows, so there is no pandas dtype inference pass
+        with _open_output(path, digest) as sink:
+            pq.write_table(rows_to_table(data), sink, **_PARQUET_WRITE_OPTIONS)
+            return sink.tell()
 
     def _read_parquet(self, path: Path) -> list[dict[str, Any]]:
         """Read data from Parquet file."""
         try:
-            import pandas as pd
-            df = pd.read_parquet(path)
-            return df.to_dict('records')
+            import pyarrow.parquet as pq
         except ImportError:
-            raise ImportError("pandas and pyarrow are required for Parquet support")
+            raise ImportError("pyarrow is required for Parquet support")
+        # Memory-mapped so column pages are decoded straight from the page cache
+        return pq.read_table(path, memory_map=True).to_pylist()
 
-    def _merge_csv(self, chunks: list[ChunkMetadata], output_path: Path):
-        """Merge CSV chunks."""
-        first_chunk = True
-        with open(output_path, 'w', newline='', encoding='utf-8') as outfile:
-            for chunk in chunks:
-                chunk_path = Path(chunk.storage_location)
-                with open(chunk_path, encoding='utf-8') as infile:
-                    if first_chunk:
-                        # Include header from first chunk
-                        outfile.write(infile.read())
-                        first_chunk = False
-                    else:
-                        # Skip header for subsequent chunks
-                        next(infile)  # Skip header line
-                        outfile.write(infile.read())
-
-    def _merge_json(self, chunks: list[ChunkMetadata], output_path: Path):
-        """Merge JSON chunks."""
-        all_data = []
-        for chunk in chunks:
-            chunk_data = self._read_json(Path(chunk.storage_location))
-            all_data.extend(chunk_data)
+    def _read_parquet_columns(self, path: Path, fields: list[str]) -> dict[str, list[Any]]:
+        """Read non-null values of the given columns without decoding the rest of the file."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow is required for Parquet support")
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(all_data, f, indent=2, default=str)
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        columns = [field for field in fields if field in parquet_file.schema_arrow.names]
+        table = parquet_file.read(columns=columns)
+        return {field: table.column(field).drop_null().to_pylist() for field in columns}
 
-    def _merge_parquet(self, chunks: list[ChunkMetadata], output_path: Path):
-        """Merge Parquet chunks."""
-        try:
-            import pandas as pd
-            dfs = []
+    def _merge_csv(
+        self,
+        chunks: list[ChunkMetadata],
+        output_path: Path,
+        digest: Any | None = None
+    ):
+        """Merge CSV chunks by streaming bytes, keeping only the first header."""
+        with _open_output(output_path, digest) as outfile:
+            for index, chunk in enumerate(chunks):
+                with open(Path(chunk.storage_location), 'rb') as infile:
+                    if index > 0:
+                        infile.readline()  # Skip header line
+                    _copy_remaining(infile, outfile)
+
+    def _merge_json(
+        self,
+        chunks: list[ChunkMetadata],
+        output_path: Path,
+        digest: Any | None = None
+    ):
+        """Merge JSON chunks by splicing the elements of each chunk's array, without parsing rows.
+
+        Chunks are written with ``indent=2``, so the spliced output is byte-identical
+        to dumping all rows as one array with the same indentation.
+        """
+        first_chunk = True
+        with _open_output(output_path, digest) as outfile:
+            outfile.write(b"[")
             for chunk in chunks:
-                df = pd.read_parquet(Path(chunk.storage_location))
-                dfs.append(df)
+                # Drop the enclosing brackets; what remains is the chunk's elements
+                elements = Path(chunk.storage_location).read_bytes().strip()[1:-1].strip()
+                if not elements:
+                    continue
+                outfile.write(b"\n  " if first_chunk else b",\n  ")
+                outfile.write(elements)
+                first_chunk = False
+            outfile.write(b"]" if first_chunk else b"\n]")
+
+    def _merge_parquet(
+        self,
+        chunks: list[ChunkMetadata],
+        output_path: Path,
+        digest: Any | None = None
+    ):
+        """Merge Parquet chunks by copying row groups, without a pandas round trip.
 
-            merged_df = pd.concat(dfs, ignore_index=True)
-            merged_df.to_parquet(output_path, index=False)
+        Small chunk row groups are coalesced up to ``target_batch_rows`` so the
+        merged file has large row groups regardless of the chunk size used.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
         except ImportError:
-            raise ImportError("pandas and pyarrow are required for Parquet support")
+            raise ImportError("pyarrow is required for Parquet support")
+
+        if not chunks:
+            raise ValueError("No Parquet chunks to merge")
+
+        files = [pq.ParquetFile(Path(chunk.storage_location), memory_map=True) for chunk in chunks]
+
+        # Chunks are written independently and rows may omit keys, so merge into the
+        # union of all chunk columns, reconciling types such as all-null columns
+        schema = pa.unify_schemas(
+            [parquet_file.schema_arrow for parquet_file in files],
+            promote_options="permissive"
+        )
 
-    def _calculate_checksum(self, path: Path) -> str:
-        """Calculate SHA256 checksum of file."""
-        sha256 = hashlib.sha256()
-        with open(path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        target_rows = settings.generation.target_batch_rows
+        pending: list[pa.Table] = []
+        pending_rows = 0
+
+        with (
+            _open_output(output_path, digest) as sink,
+            pq.ParquetWriter(sink, schema, **_PARQUET_WRITE_OPTIONS) as writer,
+        ):
+            for parquet_file in files:
+                for i in range(parquet_file.num_row_groups):
+                    table = parquet_file.read_row_group(i)
+                    for field in schema:
+                        if field.name not in table.column_names:
+                            table = table.append_column(
+                                field, pa.nulls(table.num_rows, field.type)
+                            )
+                    table = table.select(schema.names).cast(schema)
+                    pending.append(table)
+                    pending_rows += table.num_rows
+
+                    if pending_rows >= target_rows:
+                        writer.write_table(pa.concat_tables(pending))
+                        pending, pending_rows = [], 0
+
+            if pending:
+                writer.write_table(pa.concat_tables(pending))
 
 
 class MemoryStorageHandler(StorageHandler):
@@ -321,26 +667,31 @@ class MemoryStorageHandler(StorageHandler):
             max_chunks: Maximum chunks to keep in memory (uses config default if not provided)
         """
         self.max_chunks = max_chunks or settings.storage.max_memory_chunks
-        self.storage: dict[tuple, list[dict[str, Any]]] = {}
-        logger.info(f"Initialized MemoryStorageHandler (max {self.max_chunks} chunks)")
+        # Chunks are grouped per job so a job's cleanup never scans other jobs
+        self.storage: dict[str, dict[int, list[dict[str, Any]]]] = {}
+        self._chunk_count = 0
+        logger.info("Initialized MemoryStorageHandler (max %s chunks)", self.max_chunks)
 
     def store_chunk(
         self,
         job_id: UUID,
         chunk_id: int,
         data: list[dict[str, Any]],
-        format: OutputFormat
+        format: OutputFormat,
+        unique_fields: list[str] | None = None
     ) -> ChunkMetadata:
-        """Store chunk in memory."""
-        key = (str(job_id), chunk_id)
+        """Store chunk in memory (unique values are read straight from the held data)."""
+        job_chunks = self.storage.setdefault(str(job_id), {})
 
-        if len(self.storage) >= self.max_chunks:
+        if self._chunk_count >= self.max_chunks:
             logger.warning("Memory storage limit reached, consider using disk storage")
 
-        self.storage[key] = data
+        if chunk_id not in job_chunks:
+            self._chunk_count += 1
+        job_chunks[chunk_id] = data
 
-        # Calculate approximate size
-        size_bytes = len(json.dumps(data, default=str))
+        # Approximate size from the first row; the data is held, not serialized
+        size_bytes = len(orjson.dumps(data[0], default=str)) * len(data) if data else 0
 
         metadata = ChunkMetadata(
             chunk_id=chunk_id,
@@ -350,7 +701,7 @@ class MemoryStorageHandler(StorageHandler):
             size_bytes=size_bytes
         )
 
-        logger.debug(f"Stored chunk {chunk_id} in memory ({size_bytes} bytes)")
+        logger.debug("Stored chunk %s in memory (%s bytes)", chunk_id, size_bytes)
         return metadata
 
     def retrieve_chunk(
@@ -359,19 +710,20 @@ class MemoryStorageHandler(StorageHandler):
         format: OutputFormat
     ) -> list[dict[str, Any]]:
         """Retrieve chunk from memory."""
-        key = (str(metadata.job_id), metadata.chunk_id)
+        job_chunks = self.storage.get(str(metadata.job_id), {})
 
-        if key not in self.storage:
-            raise KeyError(f"Chunk not found in memory: {key}")
+        if metadata.chunk_id not in job_chunks:
+            raise KeyError(f"Chunk not found in memory: {metadata.job_id}/{metadata.chunk_id}")
 
-        return self.storage[key]
+        return job_chunks[metadata.chunk_id]
 
     def merge_chunks(
         self,
         job_id: UUID,
         chunks: list[ChunkMetadata],
         output_path: Path,
-        format: OutputFormat
+        format: OutputFormat,
+        digest: Any | None = None
     ) -> Path:
         """Merge chunks and write to disk."""
         # Sort chunks by ID
@@ -387,38 +739,43 @@ class MemoryStorageHandler(StorageHandler):
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         if format == OutputFormat.CSV:
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            sink = _open_output(output_path, digest)
+            with io.TextIOWrapper(sink, encoding='utf-8', newline='') as f:
                 if all_data:
                     writer = csv.DictWriter(f, fieldnames=all_data[0].keys())
                     writer.writeheader()
                     writer.writerows(all_data)
         elif format == OutputFormat.JSON:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(all_data, f, indent=2, default=str)
+            with _open_output(output_path, digest) as f:
+                f.write(orjson.dumps(all_data, default=str, option=orjson.OPT_INDENT_2))
         elif format == OutputFormat.PARQUET:
             try:
-                import pandas as pd
-                df = pd.DataFrame(all_data)
-                df.to_parquet(output_path, index=False)
+                import pyarrow.parquet as pq
             except ImportError:
-                raise ImportError("pandas and pyarrow are required for Parquet support")
+                raise ImportError("pyarrow is required for Parquet support")
+            # Rows go straight into Arrow columns, without a pandas DataFrame in between
+            with _open_output(output_path, digest) as f:
+                pq.write_table(rows_to_table(all_data), f, **_PARQUET_WRITE_OPTIONS)
 
-        logger.info(f"Merged {len(chunks)} chunks to {output_path}")
+        logger.info("Merged %s chunks to %s", len(chunks), output_path)
         return output_path
 
     def delete_chunk(self, metadata: ChunkMetadata):
         """Delete chunk from memory."""
-        key = (str(metadata.job_id), metadata.chunk_id)
-        if key in self.storage:
-            del self.storage[key]
-            logger.debug(f"Deleted chunk {metadata.chunk_id} from memory")
+        job_chunks = self.storage.get(str(metadata.job_id))
+        if job_chunks is not None and job_chunks.pop(metadata.chunk_id, None) is not None:
+            self._chunk_count -= 1
+            logger.debug("Deleted chunk %s from memory", metadata.chunk_id)
 
     def cleanup_job(self, job_id: UUID):
         """Clean up all chunks for job."""
-        keys_to_delete = [k for k in self.storage.keys() if k[0] == str(job_id)]
-        for key in keys_to_delete:
-            del self.storage[key]
-        logger.info(f"Cleaned up job {job_id} from memory ({len(keys_to_delete)} chunks)")
+        removed = self.storage.pop(str(job_id), {})
+        self._chunk_count -= len(removed)
+        logger.info("Cleaned up job %s from memory (%s chunks)", job_id, len(removed))
+
+
+# Handlers are shared per storage type so in-memory chunks survive between calls
+_storage_handlers: dict[str, StorageHandler] = {}
 
 
 def get_storage_handler(storage_type: str | None = None) -> StorageHandler:
@@ -431,14 +788,23 @@ def get_storage_handler(storage_type: str | None = None) -> StorageHandler:
         Configured storage handler
     """
     storage_type = storage_type or settings.storage.type
+    # StorageType members hash by name, so key on the plain value
+    storage_type = getattr(storage_type, "value", storage_type)
+
+    handler = _storage_handlers.get(storage_type)
+    if handler is not None:
+        return handler
 
     if storage_type == "disk":
-        return DiskStorageHandler()
+        handler = DiskStorageHandler()
     elif storage_type == "memory":
-        return MemoryStorageHandler()
+        handler = MemoryStorageHandler()
     elif storage_type == "cloud":
         # TODO: Implement cloud storage handler
         logger.warning("Cloud storage not yet implemented, falling back to disk")
-        return DiskStorageHandler()
+        handler = DiskStorageHandler()
     else:
         raise ValueError(f"Unknown storage type: {storage_type}")
+
+    _storage_handlers[storage_type] = handler
+    return handler
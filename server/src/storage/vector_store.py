@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
 import threading
 import uuid
+from collections import OrderedDict
 from collections.abc import Iterable
 from typing import Any
 
-from sentence_transformers import SentenceTransformer
+import numpy as np
 
 from src.config import settings
 from src.utils.logger import get_logger
@@ -22,6 +24,9 @@ except ImportError as exc:  # pragma: no cover - dependency should exist, but gu
     EmbeddingFunction = Any  # type: ignore[assignment]
     logger.error("ChromaDB dependency missing: %s", exc)
 
+# Number of content digests remembered to skip re-embedding repeated rows
+_SEEN_CONTENT_LIMIT = 100_000
+
 
 class VectorStore:
     """Chroma-backed vector store for row deduplication."""
@@ -40,11 +45,38 @@ class VectorStore:
             name=config.collection_name,
             metadata={"hnsw:space": "cosine"},
         )
+        # Imported here so the storage package loads without the embedding stack installed
+        from sentence_transformers import SentenceTransformer
+
         self._model_name = config.embedding_model
         logger.info("Loading sentence transformer model: %s", self._model_name)
         self._embedder = SentenceTransformer(self._model_name)
         self._similarity_threshold = config.similarity_threshold
-        self._lock = threading.Lock()
+        self._in_memory_limit = config.in_memory_limit
+        # Reentrant so filter_new_rows can hold it from the duplicate check through the
+        # add while the helpers it calls take it again
+        self._lock = threading.RLock()
+        self._matrix = self._load_matrix()
+        # Digests of contents already stored or rejected; any repeat is a duplicate
+        self._seen_contents: OrderedDict[bytes, None] = OrderedDict()
+
+    def _load_matrix(self) -> np.ndarray | None:
+        """Mirror the stored embeddings in memory while the collection is small enough."""
+        count = self._collection.count()
+        if count > self._in_memory_limit:
+            logger.info("Collection holds %s vectors, searching through ChromaDB", count)
+            return None
+
+        dimension = self._embedder.get_sentence_embedding_dimension()
+        if count == 0:
+            return np.empty((0, dimension), dtype=np.float32)
+
+        stored = self._collection.get(include=["embeddings"])
+        matrix = np.asarray(stored["embeddings"], dtype=np.float32).reshape(-1, dimension)
+        # Older entries may predate normalized embeddings
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
 
     def filter_new_rows(
         self,
@@ -66,22 +98,45 @@ class VectorStore:
             return [], []
 
         unique_fields = list(unique_fields or [])
-        accepted: list[dict[str, Any]] = []
-        duplicates: list[dict[str, Any]] = []
+        contents = [self._build_content(row, unique_fields) for row in rows]
+        digests = [self._content_digest(content) if content else None for content in contents]
+        is_duplicate = [False] * len(rows)
 
-        for row in rows:
-            content = self._build_content(row, unique_fields)
-            if not content:
-                accepted.append(row)
-                continue
+        # Rows without content (a unique field is null) are accepted unchecked, and
+        # contents seen before are duplicates without being embedded or queried
+        candidates = []
+        batch_digests: set[bytes] = set()
+        with self._lock:
+            for index, digest in enumerate(digests):
+                if digest is None:
+                    continue
+                if digest in batch_digests or digest in self._seen_contents:
+                    is_duplicate[index] = True
+                    continue
+                batch_digests.add(digest)
+                candidates.append(index)
 
-            embedding = self._encode_text(content)
-            if self._is_duplicate(embedding):
-                duplicates.append(row)
-                continue
+        if candidates:
+            # One batched encode and one query for the whole chunk instead of one per row
+            embeddings = self._embedder.encode(
+                [contents[index] for index in candidates],
+                batch_size=64,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+
+        # Only encoding runs unlocked: the check against stored vectors and the add
+        # happen under one lock, so concurrent calls cannot both accept the same row
+        with self._lock:
+            if candidates:
+                self._accept_new_candidates(
+                    job_id, contents, digests, candidates, embeddings, is_duplicate
+                )
+            self._remember_contents(digest for digest in digests if digest is not None)
 
-            self._add_embedding(job_id, content, embedding)
-            accepted.append(row)
+        accepted = [row for row, duplicate in zip(rows, is_duplicate) if not duplicate]
+        duplicates = [row for row, duplicate in zip(rows, is_duplicate) if duplicate]
 
         if duplicates:
             logger.info(
@@ -92,33 +147,100 @@ class VectorStore:
 
         return accepted, duplicates
 
-    def _encode_text(self, text: str) -> list[float]:
-        vector = self._embedder.encode(text, convert_to_numpy=True)
-        return vector.tolist()
+    def _accept_new_candidates(
+        self,
+        job_id: str,
+        contents: list[str],
+        digests: list[bytes | None],
+        candidates: list[int],
+        embeddings: np.ndarray,
+        is_duplicate: list[bool],
+    ):
+        """Mark candidates matching stored or earlier rows as duplicates and store the rest.
+
+        Callers hold the lock, so no row is added between the checks and the add.
+        """
+        # Another call may have stored the same content while this one was encoding
+        for index in candidates:
+            if digests[index] in self._seen_contents:
+                is_duplicate[index] = True
+
+        stored_distances = self._nearest_stored_distances(embeddings)
+
+        new_positions: list[int] = []
+        for position, index in enumerate(candidates):
+            if is_duplicate[index] or stored_distances[position] <= self._similarity_threshold:
+                is_duplicate[index] = True
+                continue
+            # Rows earlier in this batch are not stored yet, so compare against
+            # them locally; embeddings are normalized, so cosine is a dot product
+            if new_positions:
+                similarity = float((embeddings[new_positions] @ embeddings[position]).max())
+                if 1.0 - similarity <= self._similarity_threshold:
+                    is_duplicate[index] = True
+                    continue
+            new_positions.append(position)
+
+        if new_positions:
+            self._add_embeddings(
+                job_id,
+                [contents[candidates[position]] for position in new_positions],
+                embeddings[new_positions],
+            )
+
+    def _remember_contents(self, digests: Iterable[bytes]):
+        """Record content digests, evicting the least recently seen past the limit."""
+        with self._lock:
+            for digest in digests:
+                self._seen_contents[digest] = None
+                self._seen_contents.move_to_end(digest)
+            while len(self._seen_contents) > _SEEN_CONTENT_LIMIT:
+                self._seen_contents.popitem(last=False)
+
+    @staticmethod
+    def _content_digest(content: str) -> bytes:
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+    def _nearest_stored_distances(self, embeddings: np.ndarray) -> list[float]:
+        """Get the cosine distance from each embedding to its nearest stored vector."""
+        matrix = self._matrix
+        if matrix is not None:
+            if not len(matrix):
+                return [float("inf")] * len(embeddings)
+            # One matrix product for the whole batch instead of an HNSW query per row
+            similarities = embeddings @ matrix.T
+            return (1.0 - similarities.max(axis=1)).tolist()
 
-    def _is_duplicate(self, embedding: list[float]) -> bool:
         with self._lock:
             results = self._collection.query(
-                query_embeddings=[embedding],
+                query_embeddings=embeddings.tolist(),
                 n_results=1,
             )
 
-        distances = results.get("distances") or []
-        if distances and distances[0]:
-            distance = distances[0][0]
-            if distance <= self._similarity_threshold:
-                return True
-        return False
+        nearest = []
+        for distances in results.get("distances") or [[] for _ in range(len(embeddings))]:
+            nearest.append(distances[0] if distances else float("inf"))
+        return nearest
 
-    def _add_embedding(self, job_id: str, content: str, embedding: list[float]):
+    def _add_embeddings(self, job_id: str, contents: list[str], embeddings: np.ndarray):
         metadata = {"job_id": str(job_id)}
         with self._lock:
             self._collection.add(
-                ids=[f"{job_id}-{uuid.uuid4()}"],
-                embeddings=[embedding],
-                metadatas=[metadata],
-                documents=[content],
+                ids=[f"{job_id}-{uuid.uuid4()}" for _ in contents],
+                embeddings=embeddings.tolist(),
+                metadatas=[metadata] * len(contents),
+                documents=contents,
             )
+            if self._matrix is None:
+                return
+            if len(self._matrix) + len(embeddings) > self._in_memory_limit:
+                logger.info(
+                    "Vector store exceeded %s vectors, searching through ChromaDB",
+                    self._in_memory_limit,
+                )
+                self._matrix = None
+            else:
+                self._matrix = np.vstack([self._matrix, embeddings.astype(np.float32)])
 
     @staticmethod
     def _build_content(row: dict[str, Any], unique_fields: Iterable[str]) -> str:
@@ -1,28 +1,52 @@
 """Logging utility for the application."""
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from src.config import settings
 
+_listener: QueueListener | None = None
+
 
 def setup_logging():
-    """Set up logging configuration."""
+    """Set up logging configuration.
+
+    Records are put on a queue and written to the file and stdout by a
+    listener thread, so logging never blocks the calling thread on I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
     # Create logs directory if it doesn't exist
     log_file = Path(settings.log_file)
     log_file.parent.mkdir(parents=True, exist_ok=True)
 
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    handlers = [logging.FileHandler(log_file), logging.StreamHandler(sys.stdout)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # The queue handler only renders the message; the listener's handlers add the prefix
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
     # Configure root logger
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper()),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[queue_handler]
     )
 
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # Flush queued records before the interpreter exits
+    atexit.register(_listener.stop)
+
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance.
@@ -1,16 +1,35 @@
 """Validation utilities for data and schema."""
 
 import re
+from collections.abc import Callable
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
-from email_validator import EmailNotValidError, validate_email
+from email_validator import SPECIAL_USE_DOMAIN_NAMES, EmailNotValidError, validate_email
 
 from src.core.models import FieldConstraint, FieldDefinition, FieldType
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_PHONE_RE = re.compile(r'^[\d\s\-\(\)\+]+$')
+_NON_DIGIT_RE = re.compile(r'\D')
+_UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+
+# Plain ASCII addresses that email_validator always accepts; anything else goes to it
+_EMAIL_ATOM = r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]"
+_EMAIL_LABEL = r"[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?"
+_SIMPLE_EMAIL_RE = re.compile(
+    rf"{_EMAIL_ATOM}{{1,64}}(?:\.{_EMAIL_ATOM}+)*@(?:{_EMAIL_LABEL}\.)+[A-Za-z]{{2,63}}"
+)
+
+
+@lru_cache(maxsize=1024)
+def _compile_pattern(pattern: str) -> re.Pattern[str]:
+    """Compile a schema-supplied pattern once per process."""
+    return re.compile(pattern)
+
 
 class ValidationError(Exception):
     """Validation error exception."""
@@ -39,33 +58,11 @@ def validate_field_value(
         return True, None
 
     # Type-specific validation
+    validator = _TYPE_VALIDATORS.get(field.type)
+    if validator is None:
+        return False, f"Unknown field type: {field.type}"
     try:
-        if field.type == FieldType.STRING:
-            return _validate_string(value, constraints)
-        elif field.type == FieldType.INTEGER:
-            return _validate_integer(value, constraints)
-        elif field.type == FieldType.FLOAT:
-            return _validate_float(value, constraints)
-        elif field.type == FieldType.BOOLEAN:
-            return _validate_boolean(value)
-        elif field.type == FieldType.DATE:
-            return _validate_date(value)
-        elif field.type == FieldType.DATETIME:
-            return _validate_datetime(value)
-        elif field.type == FieldType.EMAIL:
-            return _validate_email_field(value)
-        elif field.type == FieldType.PHONE:
-            return _validate_phone(value)
-        elif field.type == FieldType.UUID:
-            return _validate_uuid(value)
-        elif field.type == FieldType.ENUM:
-            return _validate_enum(value, constraints)
-        elif field.type == FieldType.JSON:
-            return True, None  # Already parsed JSON
-        elif field.type == FieldType.ARRAY:
-            return _validate_array(value, constraints)
-        else:
-            return False, f"Unknown field type: {field.type}"
+        return validator(value, constraints)
     except Exception as e:
         return False, f"Validation error: {str(e)}"
 
@@ -81,7 +78,7 @@ def _validate_string(value: Any, constraints: FieldConstraint) -> tuple[bool, st
     if constraints.max_length and len(value) > constraints.max_length:
         return False, f"String length must not exceed {constraints.max_length}"
 
-    if constraints.pattern and not re.match(constraints.pattern, value):
+    if constraints.pattern and not _compile_pattern(constraints.pattern).match(value):
         return False, f"String does not match pattern: {constraints.pattern}"
 
     return True, None
@@ -168,6 +165,9 @@ def _validate_email_field(value: Any) -> tuple[bool, str | None]:
     if not isinstance(value, str):
         return False, "Email must be a string"
 
+    if _is_simple_email(value):
+        return True, None
+
     try:
         validate_email(value, check_deliverability=False)
         return True, None
@@ -175,18 +175,32 @@ def _validate_email_field(value: Any) -> tuple[bool, str | None]:
         return False, f"Invalid email: {str(e)}"
 
 
+def _is_simple_email(value: str) -> bool:
+    """Check for an address that needs none of email_validator's normalization."""
+    if len(value) > 254 or not _SIMPLE_EMAIL_RE.fullmatch(value):
+        return False
+    local, _, domain = value.rpartition("@")
+    # Punycode labels and special-use domains need the full checks
+    if len(local) > 64 or "--" in domain:
+        return False
+    domain = domain.lower()
+    return not any(
+        domain == special or domain.endswith("." + special)
+        for special in SPECIAL_USE_DOMAIN_NAMES
+    )
+
+
 def _validate_phone(value: Any) -> tuple[bool, str | None]:
     """Validate phone number value."""
     if not isinstance(value, str):
         return False, "Phone number must be a string"
 
     # Basic phone validation - allow digits, spaces, dashes, parentheses, plus
-    pattern = r'^[\d\s\-\(\)\+]+$'
-    if not re.match(pattern, value):
+    if not _PHONE_RE.match(value):
         return False, "Invalid phone number format"
 
     # Check if it has enough digits
-    digits = re.sub(r'\D', '', value)
+    digits = _NON_DIGIT_RE.sub('', value)
     if len(digits) < 10:
         return False, "Phone number must have at least 10 digits"
 
@@ -198,8 +212,7 @@ def _validate_uuid(value: Any) -> tuple[bool, str | None]:
     if not isinstance(value, str):
         return False, "UUID must be a string"
 
-    uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-    if not re.match(uuid_pattern, value.lower()):
+    if not _UUID_RE.match(value.lower()):
         return False, "Invalid UUID format"
 
     return True, None
@@ -207,10 +220,16 @@ def _validate_uuid(value: Any) -> tuple[bool, str | None]:
 
 def _validate_enum(value: Any, constraints: FieldConstraint) -> tuple[bool, str | None]:
     """Validate enum value."""
-    if not constraints.enum_values:
+    allowed = constraints.enum_set
+    if not allowed:
         return False, "Enum values not specified"
 
-    if value not in constraints.enum_values:
+    try:
+        found = value in allowed
+    except TypeError:
+        # Unhashable values (lists, dicts) can never be one of the enum strings
+        found = False
+    if not found:
         return False, f"Value must be one of: {', '.join(map(str, constraints.enum_values))}"
 
     return True, None
@@ -230,6 +249,28 @@ def _validate_array(value: Any, constraints: FieldConstraint) -> tuple[bool, str
     return True, None
 
 
+def _validate_json(value: Any) -> tuple[bool, str | None]:
+    """Validate JSON value."""
+    return True, None  # Already parsed JSON
+
+
+# One dict lookup per value instead of walking an if/elif ladder over FieldType
+_TYPE_VALIDATORS: dict[FieldType, Callable[[Any, FieldConstraint], tuple[bool, str | None]]] = {
+    FieldType.STRING: _validate_string,
+    FieldType.INTEGER: _validate_integer,
+    FieldType.FLOAT: _validate_float,
+    FieldType.BOOLEAN: lambda value, _: _validate_boolean(value),
+    FieldType.DATE: lambda value, _: _validate_date(value),
+    FieldType.DATETIME: lambda value, _: _validate_datetime(value),
+    FieldType.EMAIL: lambda value, _: _validate_email_field(value),
+    FieldType.PHONE: lambda value, _: _validate_phone(value),
+    FieldType.UUID: lambda value, _: _validate_uuid(value),
+    FieldType.ENUM: _validate_enum,
+    FieldType.JSON: lambda value, _: _validate_json(value),
+    FieldType.ARRAY: _validate_array,
+}
+
+
 def validate_row(row: dict, schema: Any) -> list[str]:
     """Validate an entire row against schema.
     
@@ -2,10 +2,16 @@
 
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
+import orjson
 import pandas as pd
+import pyarrow as pa
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure page
 st.set_page_config(
@@ -18,34 +24,151 @@ st.set_page_config(
 # API Configuration
 API_BASE_URL = "http://localhost:8080"
 
+# Job statuses after which a job never changes again
+FINAL_JOB_STATUSES = {"completed", "failed", "cancelled"}
+
+# Status polling starts at this interval and backs off while progress stalls
+POLL_INITIAL_INTERVAL = 1.0
+POLL_BACKOFF_FACTOR = 1.5
+# Polls long-poll for at most this long; control clicks wait for the running poll
+STATUS_LONG_POLL_MAX_WAIT = 5.0
+
+# Repeat clicks of the same job control within this window are ignored
+CONTROL_DEBOUNCE_SECONDS = 2.0
+
+# Built once rather than on every rerun
+SCHEMA_PLACEHOLDER = json.dumps({
+    "fields": [
+        {
+            "name": "id",
+            "type": "uuid",
+            "description": "Unique identifier"
+        },
+        {
+            "name": "name",
+            "type": "string",
+            "description": "Customer name"
+        }
+    ]
+}, indent=2)
+
+STATUS_EMOJI = {
+    "completed": "✅",
+    "generating": "⏳",
+    "pending": "⏱️",
+    "failed": "❌",
+    "paused": "⏸️",
+    "cancelled": "🚫"
+}
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+DOWNLOAD_MIME_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+
+@st.cache_resource
+def get_http_session():
+    """Get the HTTP session shared by all reruns, so API connections are kept alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        # Only idempotent GETs are retried on gateway errors
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=["GET"]
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def post_json(url, payload, **kwargs):
+    """POST a payload encoded with orjson through the shared session."""
+    return get_http_session().post(url, data=orjson.dumps(payload), headers=JSON_HEADERS, **kwargs)
+
 
+@st.cache_data(ttl=5, show_spinner=False)
 def check_api_health():
     """Check if API server is healthy."""
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=2)
+        response = get_http_session().get(f"{API_BASE_URL}/health", timeout=2)
         return response.status_code == 200
     except:
         return False
 
 
 def extract_schema(user_input, context=None, example_data=None):
-    """Extract schema from natural language."""
+    """Extract schema from natural language.
+
+    Runs on a worker thread (see start_schema_extraction), so failures are
+    raised to the caller instead of being reported with st.error.
+    """
+    payload = {
+        "user_input": user_input,
+        "context": context or {},
+        "example_data": example_data
+    }
+    # Canonical JSON so identical requests share one cache entry
+    return request_schema_extraction(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS))
+
+
+@st.cache_data(persist="disk", max_entries=256, show_spinner=False)
+def request_schema_extraction(payload_json):
+    """Post a schema extraction request; results persist on disk across restarts."""
+    response = get_http_session().post(
+        f"{API_BASE_URL}/schema/extract",
+        data=payload_json,
+        headers=JSON_HEADERS,
+        timeout=480  # 8 minutes for schema extraction
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+@st.cache_resource
+def get_executor():
+    """Get the thread pool that runs long API calls off the script thread."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="api")
+
+
+def start_schema_extraction(user_input, context=None, example_data=None):
+    """Start extracting a schema in the background; schema_extraction_status reports the result."""
+    st.session_state.pop("extraction_result", None)
+    st.session_state.pop("extraction_error", None)
+    st.session_state.extraction_future = get_executor().submit(
+        extract_schema, user_input, context, example_data
+    )
+
+
+def schema_extraction_status():
+    """Wait for a background schema extraction without blocking the rest of the page."""
+    future = st.session_state.get("extraction_future")
+    if future is None:
+        return
+
+    if not future.done():
+        st.info("⏳ Extracting schema from your description...")
+        return
+
+    del st.session_state.extraction_future
     try:
-        payload = {
-            "user_input": user_input,
-            "context": context or {},
-            "example_data": example_data
-        }
-        response = requests.post(
-            f"{API_BASE_URL}/schema/extract",
-            json=payload,
-            timeout=480  # 2 minutes for schema extraction
-        )
-        response.raise_for_status()
-        return response.json()
+        result = future.result()
+        st.session_state.extraction_result = result
+        st.session_state.schema = result["schema"]
     except Exception as e:
-        st.error(f"Failed to extract schema: {e}")
-        return None
+        st.session_state.extraction_error = f"Failed to extract schema: {e}"
+    # Rerun the page so it shows the result and this fragment stops polling
+    st.rerun()
 
 
 def create_job(schema, total_rows, chunk_size=1000, output_format="csv"):
@@ -59,57 +182,90 @@ def create_job(schema, total_rows, chunk_size=1000, output_format="csv"):
             "storage_type": "disk",
             "uniqueness_fields": []
         }
-        response = requests.post(
+        response = post_json(
             f"{API_BASE_URL}/jobs/create",
-            json=payload,
-            timeout=None  # No timeout - job creation is async
+            payload,
+            timeout=30  # Generation runs as a server background task, so this returns quickly
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
         st.error(f"Failed to create job: {e}")
         return None
 
 
-def get_job_status(job_id):
-    """Get job status."""
+def get_job_status(job_id, since_version=None, wait=0):
+    """Get job status.
+
+    Args:
+        job_id: Job to query
+        since_version: Progress version last seen; with wait, the API holds the
+            request until the version moves past it or the job finishes
+        wait: Longest time in seconds the API may hold the request
+    """
+    params = {"since_version": since_version, "wait": wait} if since_version is not None else None
     try:
-        response = requests.get(
+        response = get_http_session().get(
             f"{API_BASE_URL}/jobs/{job_id}/status",
-            timeout=30  # Longer timeout for status checks
+            params=params,
+            timeout=30 + wait  # Longer timeout for status checks
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
         st.error(f"Failed to get job status: {e}")
         return None
 
 
-def get_job_details(job_id):
+def fetch_job_details(job_id):
     """Get detailed job information."""
     try:
-        response = requests.get(
+        response = get_http_session().get(
             f"{API_BASE_URL}/jobs/{job_id}",
             timeout=30
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
         st.error(f"Failed to get job details: {e}")
         return None
 
 
+@st.cache_data(ttl=2, show_spinner=False)
+def get_job_details(job_id):
+    """Get detailed job information, cached briefly while the job may still change."""
+    return fetch_job_details(job_id)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_final_job_details(job_id):
+    """Get detailed information for a job that has reached a final status and no longer changes."""
+    return fetch_job_details(job_id)
+
+
+def get_job_details_for_status(job_id, status):
+    """Get job details, cached for longer once the job has finished."""
+    if status["status"] in FINAL_JOB_STATUSES:
+        details = get_final_job_details(job_id)
+        if details is None:
+            # Do not keep a failed fetch for the long TTL
+            get_final_job_details.clear(job_id)
+        return details
+    return get_job_details(job_id)
+
+
+@st.cache_data(ttl=2, show_spinner=False)
 def list_jobs(status=None):
     """List all jobs."""
     try:
         params = {"status": status} if status else {}
-        response = requests.get(
+        response = get_http_session().get(
             f"{API_BASE_URL}/jobs/",
             params=params,
             timeout=30
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
         st.error(f"Failed to list jobs: {e}")
         return None
@@ -122,45 +278,82 @@ def control_job(job_id, action):
             "job_id": str(job_id),
             "action": action
         }
-        response = requests.post(
+        response = post_json(
             f"{API_BASE_URL}/jobs/{job_id}/control",
-            json=payload,
+            payload,
             timeout=30
         )
         response.raise_for_status()
-        return response.json()
+        # The job changed, so drop cached views of it
+        get_job_details.clear()
+        list_jobs.clear()
+        st.session_state.get("job_polls", {}).pop(str(job_id), None)
+        return orjson.loads(response.content)
     except Exception as e:
         st.error(f"Failed to {action} job: {e}")
         return None
 
 
 def preview_job_output(job_id, rows=10):
-    """Preview job output."""
+    """Preview job output.
+
+    Asks for an Arrow IPC stream, which st.dataframe renders without any
+    conversion, and falls back to the JSON response for older servers.
+
+    Returns:
+        Tuple of (preview rows as an Arrow table or DataFrame, total rows in the dataset),
+        or None on failure
+    """
     try:
-        response = requests.get(
+        response = get_http_session().get(
             f"{API_BASE_URL}/jobs/{job_id}/preview",
             params={"rows": rows},
+            headers={"Accept": f"{ARROW_STREAM_MEDIA_TYPE}, application/json"},
             timeout=60  # Longer timeout for preview
         )
         response.raise_for_status()
-        return response.json()
+        if response.headers.get("content-type", "").startswith(ARROW_STREAM_MEDIA_TYPE):
+            table = pa.ipc.open_stream(response.content).read_all()
+            return table, int(response.headers["x-total-rows"])
+
+        preview = orjson.loads(response.content)
+        try:
+            # Arrow-backed columns are what st.dataframe sends to the browser anyway
+            df = pa.Table.from_pylist(preview["data"]).to_pandas(types_mapper=pd.ArrowDtype)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Columns mixing value types cannot be one Arrow type
+            df = pd.DataFrame(preview["data"])
+        return df, preview["total_rows"]
     except Exception as e:
         st.error(f"Failed to preview output: {e}")
         return None
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_preview_frame(job_id, rows=10):
+    """Get a completed job's preview, fetched once rather than on every rerun.
+
+    Returns:
+        Tuple of (preview rows, total rows in the dataset), or None on failure
+    """
+    return preview_job_output(job_id, rows=rows)
+
+
 def download_job_output(job_id):
-    """Download job output."""
-    try:
-        response = requests.get(
-            f"{API_BASE_URL}/jobs/{job_id}/download",
-            timeout=300  # 5 minutes for large file downloads
-        )
-        response.raise_for_status()
-        return response.content
-    except Exception as e:
-        st.error(f"Failed to download output: {e}")
-        return None
+    """Download job output.
+
+    Passed to st.download_button as deferred data, so the dataset is only fetched
+    when the user clicks the button, on a thread separate from the script run.
+
+    Returns:
+        The dataset file contents
+    """
+    response = get_http_session().get(
+        f"{API_BASE_URL}/jobs/{job_id}/download",
+        timeout=300  # 5 minutes for large file downloads
+    )
+    response.raise_for_status()
+    return response.content
 
 
 # Main UI
@@ -186,6 +379,10 @@ def main():
         ["Create Dataset", "Monitor Jobs", "Browse Jobs"]
     )
 
+    if st.sidebar.button("Clear schema cache"):
+        request_schema_extraction.clear()
+        st.sidebar.success("Schema cache cleared")
+
     if page == "Create Dataset":
         create_dataset_page()
     elif page == "Monitor Jobs":
@@ -236,45 +433,37 @@ def create_dataset_page():
                 st.warning("Please provide a dataset description")
                 return
 
-            with st.spinner("Extracting schema from your description..."):
-                context = None
-                if context_text:
-                    try:
-                        context = json.loads(context_text)
-                    except:
-                        st.warning("Invalid JSON in context, ignoring")
+            context = None
+            if context_text:
+                try:
+                    context = json.loads(context_text)
+                except:
+                    st.warning("Invalid JSON in context, ignoring")
 
-                result = extract_schema(user_input, context, example_data)
+            start_schema_extraction(user_input, context, example_data)
 
-                if result:
-                    st.session_state.schema = result["schema"]
-                    st.success("✅ Schema extracted successfully!")
-                    st.json(result["schema"])
+        if "extraction_future" in st.session_state:
+            st.fragment(schema_extraction_status, run_every=1)()
 
-                    if result.get("metadata", {}).get("suggestions"):
-                        with st.expander("💡 Suggestions"):
-                            for suggestion in result["metadata"]["suggestions"]:
-                                st.info(suggestion)
+        if "extraction_error" in st.session_state:
+            st.error(st.session_state.extraction_error)
+
+        result = st.session_state.get("extraction_result")
+        if result:
+            st.success("✅ Schema extracted successfully!")
+            st.json(result["schema"])
+
+            if result.get("metadata", {}).get("suggestions"):
+                with st.expander("💡 Suggestions"):
+                    for suggestion in result["metadata"]["suggestions"]:
+                        st.info(suggestion)
 
     else:  # JSON Schema
         st.subheader("Provide JSON Schema")
 
         schema_text = st.text_area(
             "JSON Schema",
-            placeholder=json.dumps({
-                "fields": [
-                    {
-                        "name": "id",
-                        "type": "uuid",
-                        "description": "Unique identifier"
-                    },
-                    {
-                        "name": "name",
-                        "type": "string",
-                        "description": "Customer name"
-                    }
-                ]
-            }, indent=2),
+            placeholder=SCHEMA_PLACEHOLDER,
             height=300
         )
 
@@ -355,100 +544,168 @@ def monitor_jobs_page():
         return
 
     # Auto-refresh toggle
-    auto_refresh = st.checkbox("Auto-refresh (every 2 seconds)", value=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        auto_refresh = st.checkbox("Auto-refresh", value=True)
+    with col2:
+        max_interval = st.slider(
+            "Poll interval (s)",
+            min_value=2,
+            max_value=30,
+            value=10,
+            help="Longest wait between status checks while progress is not advancing",
+            disabled=not auto_refresh
+        )
 
-    # Create placeholder for live updates
-    status_placeholder = st.empty()
-    progress_placeholder = st.empty()
-    details_placeholder = st.empty()
-    preview_placeholder = st.empty()
+    # Only the status panel reruns on each tick; finished jobs stop refreshing
+    finished = job_id_input in st.session_state.setdefault("finished_jobs", set())
+    if auto_refresh and not finished:
+        st.fragment(job_status_panel, run_every=POLL_INITIAL_INTERVAL)(job_id_input, max_interval)
+    else:
+        job_status_panel(job_id_input)
+
+
+def poll_job_status(job_id, max_interval):
+    """Get job status, polling the API less often while progress is not advancing.
+
+    The wait between polls starts at POLL_INITIAL_INTERVAL, grows by
+    POLL_BACKOFF_FACTOR up to max_interval while progress is unchanged, and
+    resets once progress advances. Between polls the last status is returned.
+    Each poll after the first long-polls on the last seen progress version for up
+    to the current interval, so a change is shown as soon as the API sees it.
+
+    Args:
+        job_id: Job to poll
+        max_interval: Longest wait between polls in seconds
+
+    Returns:
+        Tuple of (status, details) from the latest poll
+    """
+    polls = st.session_state.setdefault("job_polls", {})
+    poll = polls.get(job_id)
+    now = time.monotonic()
+    if poll and now < poll["next_poll"]:
+        return poll["status"], poll["details"]
+
+    if poll:
+        wait = min(poll["interval"], STATUS_LONG_POLL_MAX_WAIT)
+        status = get_job_status(job_id, since_version=poll["status"]["version"], wait=wait)
+    else:
+        status = get_job_status(job_id)
+    details = get_job_details_for_status(job_id, status) if status else None
+
+    interval = POLL_INITIAL_INTERVAL
+    if poll and status and status["version"] <= poll["status"]["version"]:
+        interval = min(poll["interval"] * POLL_BACKOFF_FACTOR, max_interval)
+
+    if status:
+        polls[job_id] = {
+            "status": status,
+            "details": details,
+            "interval": interval,
+            "next_poll": now + interval
+        }
+    return status, details
 
-    while True:
-        with status_placeholder.container():
-            status = get_job_status(job_id_input)
 
-            if status:
-                col1, col2, col3, col4 = st.columns(4)
+def send_job_control(job_id, action):
+    """Send a control action, ignoring a repeat of the same action sent moments ago.
 
-                with col1:
-                    st.metric("Status", status["status"])
+    Under polling lag a double click would otherwise post the action twice.
+    """
+    now = time.monotonic()
+    last = st.session_state.get("last_job_control")
+    if last and last[:2] == (job_id, action) and now - last[2] < CONTROL_DEBOUNCE_SECONDS:
+        return
+    st.session_state.last_job_control = (job_id, action, now)
+    control_job(job_id, action)
 
-                with col2:
-                    st.metric("Progress", f"{status['progress_percentage']:.1f}%")
 
-                with col3:
-                    st.metric("Rows Generated", f"{status['rows_generated']:,}")
+def job_status_panel(job_id, max_interval=None):
+    """Render status, controls, preview and details for a job.
 
-                with col4:
-                    st.metric("Chunks", f"{status['chunks_completed']}/{status['total_chunks']}")
-
-                # Progress bar
-                with progress_placeholder:
-                    st.progress(status["progress_percentage"] / 100)
-
-                # Control buttons
-                if status["status"] == "generating":
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button("⏸️ Pause Job"):
-                            control_job(job_id_input, "pause")
-                            st.rerun()
-                    with col2:
-                        if st.button("❌ Cancel Job"):
-                            control_job(job_id_input, "cancel")
-                            st.rerun()
-
-                elif status["status"] == "paused":
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button("▶️ Resume Job"):
-                            control_job(job_id_input, "resume")
-                            st.rerun()
-                    with col2:
-                        if st.button("❌ Cancel Job"):
-                            control_job(job_id_input, "cancel")
-                            st.rerun()
-
-                elif status["status"] == "completed":
-                    st.success("✅ Job completed successfully!")
-
-                    # Preview data
-                    with preview_placeholder:
-                        st.subheader("Data Preview")
-                        preview = preview_job_output(job_id_input, rows=20)
-                        if preview and preview["data"]:
-                            df = pd.DataFrame(preview["data"])
-                            st.dataframe(df, use_container_width=True)
-                            st.caption(f"Showing {len(preview['data'])} of {preview['total_rows']} rows")
-
-                    # Download button
-                    if st.button("📥 Download Dataset", type="primary"):
-                        with st.spinner("Downloading..."):
-                            data = download_job_output(job_id_input)
-                            if data:
-                                st.download_button(
-                                    label="💾 Save File",
-                                    data=data,
-                                    file_name=f"synthetic_data_{job_id_input}.csv",
-                                    mime="text/csv"
-                                )
-
-                elif status["status"] == "failed":
-                    st.error(f"❌ Job failed: {status.get('error_message', 'Unknown error')}")
-
-                # Job details
-                with details_placeholder:
-                    with st.expander("Job Details"):
-                        details = get_job_details(job_id_input)
-                        if details:
-                            st.json(details)
-
-        if not auto_refresh or status.get("status") in ["completed", "failed", "cancelled"]:
-            break
-
-        time.sleep(2)
+    Args:
+        job_id: Job to render
+        max_interval: Longest wait between polls when auto-refreshing, or None to poll now
+    """
+    if max_interval is None:
+        status = get_job_status(job_id)
+        details = get_job_details_for_status(job_id, status) if status else None
+    else:
+        status, details = poll_job_status(job_id, max_interval)
+    if not status:
+        return
+
+    if status["status"] in FINAL_JOB_STATUSES and job_id not in st.session_state.finished_jobs:
+        # Rerun the whole page once so the panel is rendered without auto-refresh
+        st.session_state.finished_jobs.add(job_id)
         st.rerun()
 
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Status", status["status"])
+
+    with col2:
+        st.metric("Progress", f"{status['progress_percentage']:.1f}%")
+
+    with col3:
+        st.metric("Rows Generated", f"{status['rows_generated']:,}")
+
+    with col4:
+        st.metric("Chunks", f"{status['chunks_completed']}/{status['total_chunks']}")
+
+    # Progress bar
+    st.progress(status["progress_percentage"] / 100)
+
+    # Control buttons; callbacks run before the rerun the click triggers
+    if status["status"] == "generating":
+        col1, col2 = st.columns(2)
+        with col1:
+            st.button("⏸️ Pause Job", on_click=send_job_control, args=(job_id, "pause"))
+        with col2:
+            st.button("❌ Cancel Job", on_click=send_job_control, args=(job_id, "cancel"))
+
+    elif status["status"] == "paused":
+        col1, col2 = st.columns(2)
+        with col1:
+            st.button("▶️ Resume Job", on_click=send_job_control, args=(job_id, "resume"))
+        with col2:
+            st.button("❌ Cancel Job", on_click=send_job_control, args=(job_id, "cancel"))
+
+    elif status["status"] == "completed":
+        st.success("✅ Job completed successfully!")
+
+        # Preview data
+        st.subheader("Data Preview")
+        preview = get_preview_frame(job_id, rows=20)
+        if preview is None:
+            # Do not keep a failed fetch for the long TTL
+            get_preview_frame.clear(job_id, rows=20)
+        elif len(preview[0]):
+            df, total_rows = preview
+            st.dataframe(df, use_container_width=True, hide_index=True)
+            st.caption(f"Showing {len(df)} of {total_rows} rows")
+
+        # Download button
+        spec = (details or {}).get("specification", {})
+        output_format = spec.get("output_format", "csv")
+        st.download_button(
+            label="📥 Download Dataset",
+            data=partial(download_job_output, job_id),
+            file_name=f"synthetic_data_{job_id}.{output_format}",
+            mime=DOWNLOAD_MIME_TYPES.get(output_format, "application/octet-stream"),
+            type="primary"
+        )
+
+    elif status["status"] == "failed":
+        st.error(f"❌ Job failed: {status.get('error_message', 'Unknown error')}")
+
+    # Job details
+    with st.expander("Job Details"):
+        if details:
+            st.json(details)
+
 
 def browse_jobs_page():
     """Page for browsing all jobs."""
@@ -487,15 +744,7 @@ def browse_jobs_page():
                     st.caption(f"Created: {job['specification']['created_at']}")
 
                 with col2:
-                    status_emoji = {
-                        "completed": "✅",
-                        "generating": "⏳",
-                        "pending": "⏱️",
-                        "failed": "❌",
-                        "paused": "⏸️",
-                        "cancelled": "🚫"
-                    }
-                    st.markdown(f"{status_emoji.get(job['progress']['status'], '⚪')} **{job['progress']['status']}**")
+                    st.markdown(f"{STATUS_EMOJI.get(job['progress']['status'], '⚪')} **{job['progress']['status']}**")
 
                 with col3:
                     st.metric("Progress", f"{job['progress']['progress_percentage']:.1f}%")
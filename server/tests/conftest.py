@@ -0,0 +1,26 @@
+"""Shared pytest configuration."""
+
+import atexit
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Settings are loaded at import time and require an API key; tests never call the API
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+# Keep the jobs, chunks, caches and logs that module-level singletons create out of the
+# working tree
+_TEST_ROOT = Path(tempfile.mkdtemp(prefix="synthetic-data-tests-"))
+atexit.register(shutil.rmtree, _TEST_ROOT, ignore_errors=True)
+for name, subdir in {
+    "TEMP_STORAGE_PATH": "temp",
+    "OUTPUT_STORAGE_PATH": "output",
+    "JOB_PERSISTENCE_PATH": "jobs",
+    "EXTRACT_SCHEMA_CACHE_DIR": "cache/extract_schema",
+    "GENERATE_CHUNK_CACHE_DIR": "cache/generate_chunk",
+    "SEMANTIC_CACHE_DIR": "cache/semantic",
+    "VECTOR_STORE_PATH": "vector_store",
+    "LOG_FILE": "logs/app.log",
+}.items():
+    os.environ.setdefault(name, str(_TEST_ROOT / subdir))
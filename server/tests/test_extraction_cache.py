@@ -0,0 +1,108 @@
+"""Test suite for the LLM response caches."""
+
+import os
+
+import numpy as np
+
+from src.core.extraction_cache import ExtractionCache, SemanticExtractionIndex
+
+
+class _WordEmbedder:
+    """Embeds text as normalized counts of a few words, standing in for the model."""
+
+    WORDS = ("customer", "order", "email", "invoice")
+
+    def encode(self, text, **kwargs):
+        words = text.lower().split()
+        vector = np.array([words.count(word) for word in self.WORDS], dtype=np.float32) + 0.01
+        return vector / np.linalg.norm(vector)
+
+
+def _semantic_index(index_dir):
+    index = SemanticExtractionIndex(index_dir, threshold=0.95)
+    index._embedder = _WordEmbedder()
+    return index
+
+
+def _put(cache, key, text):
+    cache.put(key, {"text": text}, provider="gemini", model="test", prompt_version="1")
+
+
+def test_cache_round_trip_leaves_no_temporary_files(tmp_path):
+    """Test that a stored response is returned and no temporary file is left behind."""
+    cache = ExtractionCache(tmp_path)
+    key = cache.make_key("gemini", "test", "1", "a user prompt")
+
+    _put(cache, key, "first")
+    _put(cache, key, "second")
+
+    assert cache.get(key) == {"text": "second"}
+    assert cache.get(cache.make_key("gemini", "test", "1", "another prompt")) is None
+    assert sorted(os.listdir(tmp_path)) == [f"{key}.json"]
+
+
+def test_make_key_separates_parts():
+    """Test that different splits of the same text get different keys."""
+    assert ExtractionCache.make_key("ab", "c") != ExtractionCache.make_key("a", "bc")
+
+
+def test_cache_evicts_least_recently_used_entries_over_budget(tmp_path):
+    """Test that the cache stays under its byte budget, keeping recently read entries."""
+    cache = ExtractionCache(tmp_path)
+    _put(cache, "key0", "x" * 100)
+    cache.max_bytes = (tmp_path / "key0.json").stat().st_size * 6
+
+    for i in range(4):
+        _put(cache, f"key{i}", "x" * 100)
+        # Distinct modification times regardless of filesystem timestamp resolution
+        os.utime(tmp_path / f"key{i}.json", (i, i))
+    assert cache.get("key0") is not None
+
+    for i in range(4, 8):
+        _put(cache, f"key{i}", "x" * 100)
+
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= cache.max_bytes
+    assert cache.get("key0") is not None
+    assert cache.get("key1") is None
+    assert cache.get("key7") is not None
+
+
+def test_cache_discards_corrupt_entries(tmp_path):
+    """Test that an unreadable entry is treated as a miss and removed."""
+    cache = ExtractionCache(tmp_path)
+    (tmp_path / "broken.json").write_bytes(b"{not json")
+
+    assert cache.get("broken") is None
+    assert not (tmp_path / "broken.json").exists()
+
+
+def test_semantic_index_matches_similar_input_in_same_scope(tmp_path):
+    """Test that a reworded input finds the earlier key only within its own scope."""
+    index = _semantic_index(tmp_path)
+    index.add("customer order email", scope="no-context", key="key-a")
+
+    assert index.lookup("an email for each customer order", scope="no-context") == "key-a"
+    assert index.lookup("customer order email", scope="other-context") is None
+    assert index.lookup("invoice", scope="no-context") is None
+
+
+def test_semantic_index_persists_entries(tmp_path):
+    """Test that indexed inputs survive reloading the index from disk."""
+    _semantic_index(tmp_path).add("customer invoice", scope="s", key="key-b")
+
+    reloaded = _semantic_index(tmp_path)
+
+    assert reloaded.lookup("invoice for a customer", scope="s") == "key-b"
+    assert not [path for path in os.listdir(tmp_path) if path.endswith(".tmp")]
+
+
+def test_semantic_index_discards_mismatched_files(tmp_path):
+    """Test that an index whose embeddings and entries disagree starts over."""
+    index = _semantic_index(tmp_path)
+    index.add("customer order", scope="s", key="key-c")
+    index.add("invoice email", scope="s", key="key-d")
+    (tmp_path / "entries.json").write_bytes(b'[{"scope": "s", "key": "key-c"}]')
+
+    reloaded = _semantic_index(tmp_path)
+
+    assert reloaded.lookup("customer order", scope="s") is None
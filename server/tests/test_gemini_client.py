@@ -0,0 +1,90 @@
+"""Test suite for the Gemini client helpers that do not call the API."""
+
+import threading
+import time
+
+from src.api.gemini_client import (
+    EXISTING_VALUES_PROMPT_SAMPLE,
+    GeminiClient,
+    TokenBucket,
+    summarize_existing_values,
+)
+from src.core.models import DataSchema, FieldConstraint, FieldDefinition, FieldType
+
+
+def _schema():
+    return DataSchema(
+        fields=[
+            FieldDefinition(
+                name="email",
+                type=FieldType.EMAIL,
+                constraints=FieldConstraint(unique=True),
+            ),
+            FieldDefinition(name="age", type=FieldType.INTEGER),
+        ]
+    )
+
+
+def test_summarize_existing_values_is_bounded():
+    """Test that the summary keeps a count and only the most recent values."""
+    values = [f"user{i}@example.com" for i in range(1000)] + ["x" * 500]
+
+    summary = summarize_existing_values({"email": values})
+
+    assert summary["email"]["used"] == 1001
+    recent = summary["email"]["recent"]
+    assert len(recent) == EXISTING_VALUES_PROMPT_SAMPLE
+    assert recent[-2] == "user999@example.com"
+    assert len(recent[-1]) < 100
+
+
+def test_data_prompt_size_does_not_grow_with_existing_values():
+    """Test that the prompt stays bounded however many unique values a job has used."""
+    client = GeminiClient(api_key="test-key")
+
+    def prompt_length(used):
+        values = {"email": [f"user{i}@example.com" for i in range(used)]}
+        prefix, suffix = client._build_data_generation_prompt(_schema(), 100, values, None)
+        return len(prefix) + len(suffix)
+
+    small = prompt_length(EXISTING_VALUES_PROMPT_SAMPLE)
+    large = prompt_length(50_000)
+
+    # Only the digit count of the larger ids and of the total grows
+    assert large - small < 200
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    """Test that a full bucket passes a burst at once and then waits for refill."""
+    bucket = TokenBucket(capacity=3, refill_per_second=20)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    started = time.monotonic()
+    waited = bucket.acquire()
+    elapsed = time.monotonic() - started
+
+    assert waited > 0
+    assert 0.04 <= elapsed < 0.5
+
+
+def test_token_bucket_caps_cost_at_capacity():
+    """Test that a request costing more than the capacity still passes once the bucket is full."""
+    bucket = TokenBucket(capacity=5, refill_per_second=1)
+
+    assert bucket.acquire(cost=50) == 0.0
+
+
+def test_token_bucket_limits_concurrent_callers():
+    """Test that threads sharing a bucket are held to its refill rate."""
+    bucket = TokenBucket(capacity=2, refill_per_second=50)
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(12)]
+
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Two tokens were available up front; the other ten refill at 50 per second
+    assert time.monotonic() - started >= 0.18
@@ -0,0 +1,62 @@
+"""Test suite for long-polling the job status endpoint."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.api_server.routers import jobs
+from src.core.models import (
+    DataSchema,
+    FieldDefinition,
+    FieldType,
+    JobProgress,
+    JobSpecification,
+    JobState,
+    JobStatus,
+)
+
+
+@pytest.fixture
+def job(monkeypatch):
+    spec = JobSpecification(
+        schema=DataSchema(fields=[FieldDefinition(name="name", type=FieldType.STRING)]),
+        total_rows=10,
+        chunk_size=5,
+    )
+    job = JobState(specification=spec, progress=JobProgress(
+        job_id=spec.job_id, status=JobStatus.GENERATING, total_chunks=2
+    ))
+    manager = SimpleNamespace(get_job=lambda job_id: job if job_id == spec.job_id else None)
+    monkeypatch.setattr(jobs, "get_job_manager", lambda: manager)
+    return job
+
+
+def test_status_long_poll_returns_when_version_moves(job):
+    """Test that a waiting status request returns as soon as progress changes."""
+    async def poll_and_bump():
+        poll = asyncio.create_task(jobs.get_job_status(
+            job.specification.job_id, since_version=job.progress.version, wait=10
+        ))
+        await asyncio.sleep(0.3)
+        job.progress.version += 1
+        return await poll
+
+    started = time.monotonic()
+    response = asyncio.run(poll_and_bump())
+
+    assert response.version == 1
+    assert time.monotonic() - started < 2
+
+
+def test_status_long_poll_times_out_without_change(job):
+    """Test that a waiting status request returns the unchanged status after the wait."""
+    started = time.monotonic()
+    response = asyncio.run(jobs.get_job_status(
+        job.specification.job_id, since_version=job.progress.version, wait=0.5
+    ))
+    elapsed = time.monotonic() - started
+
+    assert response.version == 0
+    assert 0.5 <= elapsed < 2
@@ -0,0 +1,121 @@
+"""Test suite for MCP chunk generation with a stand-in for the Gemini call."""
+
+import asyncio
+import itertools
+import json
+from uuid import UUID
+
+import pytest
+
+from src.config import settings
+from src.mcp_server import server
+
+SCHEMA = {"fields": [{"name": "id", "type": "integer"}, {"name": "name", "type": "string"}]}
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    """Replace the Gemini call with one that numbers rows and records each request size."""
+    calls = []
+    counter = itertools.count()
+
+    def generate_data_chunk(schema, num_rows, existing_values=None, seed=None):
+        calls.append(num_rows)
+        return [{"id": next(counter), "name": "row"} for _ in range(num_rows)]
+
+    monkeypatch.setattr(server.gemini_client, "generate_data_chunk", generate_data_chunk)
+    return calls
+
+
+def _call(name, arguments):
+    return asyncio.run(server.call_tool(name, arguments))[0].text
+
+
+def _result(text):
+    return json.loads(text.split("\n\n", 1)[1])
+
+
+def _create_job(**arguments):
+    return _result(_call("create_job", {"schema": SCHEMA, **arguments}))["job_id"]
+
+
+def test_batch_packs_small_chunks_into_one_request(llm_calls, monkeypatch):
+    """Test that consecutive chunks share a request up to max_rows_per_request."""
+    monkeypatch.setattr(settings, "max_rows_per_request", 25)
+    job_id = _create_job(total_rows=40, chunk_size=10)
+
+    result = _result(_call("generate_chunk", {"job_id": job_id, "chunk_ids": [0, 1, 2, 3]}))
+
+    assert llm_calls == [20, 20]
+    assert result["rows_generated"] == 40
+    assert [chunk["rows_generated"] for chunk in result["chunks"]] == [10, 10, 10, 10]
+
+    job = server.job_manager.get_job(UUID(job_id))
+    rows = [
+        row
+        for chunk in job.chunks
+        for row in server.storage_handler.retrieve_chunk(chunk, job.specification.output_format)
+    ]
+    assert len({row["id"] for row in rows}) == 40
+    assert job.progress.status.value == "completed"
+
+
+def test_batch_skips_repeated_and_stored_chunks(llm_calls):
+    """Test that a chunk id is generated once however often it is requested."""
+    job_id = _create_job(total_rows=30, chunk_size=10)
+    _call("generate_chunk", {"job_id": job_id, "chunk_id": 0})
+
+    result = _result(_call("generate_chunk", {"job_id": job_id, "chunk_ids": [0, 1, 1]}))
+
+    assert sum(llm_calls) == 20
+    assert result["issues"] == ["Chunk 0: skipped, already generated"]
+    assert [chunk["chunk_id"] for chunk in result["chunks"]] == [1]
+
+
+def test_unique_fields_drop_repeated_values(monkeypatch):
+    """Test that rows repeating an earlier chunk's unique value are not stored."""
+    def generate_data_chunk(schema, num_rows, existing_values=None, seed=None):
+        return [{"id": i, "name": "row"} for i in range(num_rows)]
+
+    monkeypatch.setattr(server.gemini_client, "generate_data_chunk", generate_data_chunk)
+    job_id = _create_job(total_rows=10, chunk_size=5, uniqueness_fields=["id"])
+
+    _call("generate_chunk", {"job_id": job_id, "chunk_id": 0})
+    text = _call("generate_chunk", {"job_id": job_id, "chunk_id": 1})
+
+    assert text.startswith("No new rows generated for this chunk")
+    assert server.job_manager.get_job(UUID(job_id)).progress.rows_generated == 5
+
+
+def test_cached_rows_are_keyed_on_the_whole_pack(llm_calls, monkeypatch):
+    """Test that seeded requests only reuse rows cached for the same chunks."""
+    monkeypatch.setattr(settings, "cache_enabled", True)
+    job = server.job_manager.get_job(UUID(_create_job(total_rows=8, chunk_size=4, seed=7)))
+
+    first = server._request_rows(job, [(0, 4), (1, 4)], 1, 8, {})
+    server._request_rows(job, [(1, 4), (2, 4)], 1, 8, {})
+    again = server._request_rows(job, [(0, 4), (1, 4)], 1, 8, {})
+
+    assert llm_calls == [8, 8]
+    assert again == first
+
+
+def test_generate_chunk_error_keeps_prefix_and_fails_job(monkeypatch):
+    """Test that a failed generation is reported with its prefix and fails the job."""
+    def generate_data_chunk(schema, num_rows, existing_values=None, seed=None):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(server.gemini_client, "generate_data_chunk", generate_data_chunk)
+    job_id = _create_job(total_rows=5, chunk_size=5)
+
+    text = _call("generate_chunk", {"job_id": job_id, "chunk_id": 0})
+
+    assert text == "Error generating chunk: model unavailable"
+    assert server.job_manager.get_job(UUID(job_id)).progress.status.value == "failed"
+
+
+def test_list_jobs_rejects_unknown_status():
+    """Test that an unknown status filter is reported instead of raising."""
+    text = _call("list_jobs", {"status": "bogus"})
+
+    assert text.startswith("Invalid status 'bogus', expected one of: pending")
@@ -13,6 +13,7 @@ from src.core.models import (
     FieldType,
     JobProgress,
     JobSpecification,
+    JobState,
     JobStatus,
     OutputFormat,
     StorageType,
@@ -69,6 +70,20 @@ def test_schema_validation():
     assert any("nonexistent" in issue for issue in issues)
 
 
+def test_schema_validation_is_cached_per_content():
+    """Test repeated validation of equal schemas returns independent results."""
+    fields = [
+        FieldDefinition(name="id", type=FieldType.INTEGER),
+        FieldDefinition(name="ref", type=FieldType.INTEGER, depends_on=["missing"])
+    ]
+
+    first = DataSchema(fields=fields).validate_constraints()
+    first.append("mutated by caller")
+    second = DataSchema(fields=fields).validate_constraints()
+
+    assert second == ["Field 'ref' depends on non-existent field 'missing'"]
+
+
 def test_job_specification():
     """Test job specification creation."""
     schema = DataSchema(
@@ -101,9 +116,107 @@ def test_job_progress_update():
         chunks_completed=3
     )
 
-    progress.update_progress()
     assert progress.progress_percentage == 30.0
 
+    progress.chunks_completed = 4
+    assert progress.progress_percentage == 40.0
+
+    progress.status = JobStatus.COMPLETED
+    assert progress.progress_percentage == 100.0
+    assert progress.model_dump()["progress_percentage"] == 100.0
+
+
+def test_job_state_add_chunk_bumps_version():
+    """Test that adding a chunk advances the progress version."""
+    job_id = UUID("12345678-1234-5678-1234-567812345678")
+    state = JobState(
+        specification=JobSpecification(
+            job_id=job_id,
+            schema=DataSchema(fields=[FieldDefinition(name="id", type=FieldType.UUID)]),
+            total_rows=2000,
+            chunk_size=1000
+        ),
+        progress=JobProgress(job_id=job_id, status=JobStatus.GENERATING, total_chunks=2)
+    )
+
+    assert state.progress.version == 0
+
+    state.add_chunk(ChunkMetadata(
+        chunk_id=0,
+        job_id=job_id,
+        rows_generated=1000,
+        storage_location="/tmp/chunk_0.csv",
+        checksum="abc123"
+    ))
+
+    assert state.progress.version == 1
+    assert state.progress.rows_generated == 1000
+
+
+def test_job_state_has_chunk():
+    """Test completed chunk lookup for loaded and newly added chunks."""
+    job_id = UUID("12345678-1234-5678-1234-567812345678")
+    state = JobState(
+        specification=JobSpecification(
+            job_id=job_id,
+            schema=DataSchema(fields=[FieldDefinition(name="id", type=FieldType.UUID)]),
+            total_rows=3000,
+            chunk_size=1000
+        ),
+        progress=JobProgress(job_id=job_id, status=JobStatus.GENERATING, total_chunks=3),
+        chunks=[ChunkMetadata(
+            chunk_id=0,
+            job_id=job_id,
+            rows_generated=1000,
+            storage_location="/tmp/chunk_0.csv",
+            checksum="abc123"
+        )]
+    )
+
+    assert state.has_chunk(0)
+    assert not state.has_chunk(2)
+
+    state.add_chunk(ChunkMetadata(
+        chunk_id=2,
+        job_id=job_id,
+        rows_generated=1000,
+        storage_location="/tmp/chunk_2.csv",
+        checksum="def456"
+    ))
+
+    assert state.has_chunk(2)
+    assert not state.has_chunk(1)
+
+
+def test_job_state_list_view_refreshes_on_progress_change():
+    """Test that the cached list view is rebuilt when progress changes."""
+    job_id = UUID("12345678-1234-5678-1234-567812345678")
+    state = JobState(
+        specification=JobSpecification(
+            job_id=job_id,
+            schema=DataSchema(fields=[FieldDefinition(name="id", type=FieldType.UUID)]),
+            total_rows=2000,
+            chunk_size=1000
+        ),
+        progress=JobProgress(job_id=job_id, status=JobStatus.GENERATING, total_chunks=2)
+    )
+
+    view = state.list_view()
+    assert view["rows_generated"] == 0
+    assert state.list_view() is view
+
+    state.add_chunk(ChunkMetadata(
+        chunk_id=0,
+        job_id=job_id,
+        rows_generated=1000,
+        storage_location="/tmp/chunk_0.csv",
+        checksum="abc123"
+    ))
+
+    view = state.list_view()
+    assert view["rows_generated"] == 1000
+    assert view["progress_percentage"] == 50.0
+
 
 def test_chunk_metadata():
     """Test chunk metadata creation."""
@@ -0,0 +1,207 @@
+"""Test suite for storage handlers."""
+
+import csv
+import hashlib
+import os
+from uuid import uuid4
+
+import orjson
+import pytest
+
+from src.core.models import OutputFormat
+from src.storage import handlers
+from src.storage.handlers import (
+    DiskStorageHandler,
+    MemoryStorageHandler,
+    drop_used_unique_values,
+)
+
+# Values that trip up naive CSV handling: quotes, delimiters, newlines, empty cells
+TRICKY_ROWS = [
+    {"id": "1", "name": 'Ann "Annie" Lee', "note": "a, b", "city": ""},
+    {"id": "2", "name": "Bob", "note": "line one\nline two", "city": "Zürich"},
+    {"id": "3", "name": "", "note": "  padded  ", "city": "東京"},
+]
+
+
+@pytest.fixture
+def disk_handler(tmp_path):
+    return DiskStorageHandler(tmp_path)
+
+
+def test_parquet_chunk_keeps_keys_missing_from_first_row(disk_handler):
+    """Test that Parquet chunks keep columns absent from the first row."""
+    data = [
+        {"id": 1, "name": "a"},
+        {"id": 2, "name": "b", "nickname": "bee"},
+    ]
+
+    metadata = disk_handler.store_chunk(uuid4(), 0, data, OutputFormat.PARQUET)
+    rows = disk_handler.retrieve_chunk(metadata, OutputFormat.PARQUET)
+
+    assert rows == [
+        {"id": 1, "name": "a", "nickname": None},
+        {"id": 2, "name": "b", "nickname": "bee"},
+    ]
+
+
+@pytest.mark.parametrize("format", [OutputFormat.JSON, OutputFormat.PARQUET])
+def test_collect_unique_values_with_list_values(disk_handler, format):
+    """Test that list-valued unique fields are deduplicated instead of failing the chunk."""
+    job_id = uuid4()
+    chunks = [
+        disk_handler.store_chunk(
+            job_id, 0, [{"tags": ["a", "b"]}, {"tags": ["c"]}], format, unique_fields=["tags"]
+        ),
+        disk_handler.store_chunk(
+            job_id, 1, [{"tags": ["a", "b"]}, {"tags": ["d"]}], format, unique_fields=["tags"]
+        ),
+    ]
+
+    values = disk_handler.collect_unique_values(chunks, ["tags"], format)
+
+    assert values == {"tags": [["a", "b"], ["c"], ["d"]]}
+
+
+def test_memory_parquet_merge_keeps_columns_missing_from_first_row(tmp_path):
+    """Test that in-memory Parquet merges keep columns absent from the first row."""
+    import pyarrow.parquet as pq
+
+    handler = MemoryStorageHandler()
+    job_id = uuid4()
+    chunks = [
+        handler.store_chunk(job_id, 0, [{"id": 1}], OutputFormat.PARQUET),
+        handler.store_chunk(job_id, 1, [{"id": 2, "email": "b@example.com"}], OutputFormat.PARQUET),
+    ]
+
+    output_path = handler.merge_chunks(
+        job_id, chunks, tmp_path / "out.parquet", OutputFormat.PARQUET
+    )
+
+    assert pq.read_table(output_path).to_pylist() == [
+        {"id": 1, "email": None},
+        {"id": 2, "email": "b@example.com"},
+    ]
+
+
+def test_drop_used_unique_values():
+    """Test that rows repeating a used or earlier value of a unique field are dropped."""
+    seen = {"email": {"a@x.com"}}
+    rows = [
+        {"email": "a@x.com"},
+        {"email": "b@x.com"},
+        {"email": "b@x.com"},
+        {"email": None},
+    ]
+
+    kept = drop_used_unique_values(rows, seen)
+
+    assert kept == [{"email": "b@x.com"}, {"email": None}]
+    assert seen == {"email": {"a@x.com", "b@x.com"}}
+
+
+def test_disk_parquet_merge_fills_columns_missing_from_some_chunks(disk_handler, tmp_path):
+    """Test that Parquet chunks with different columns merge into their union."""
+    import pyarrow.parquet as pq
+
+    job_id = uuid4()
+    chunks = [
+        disk_handler.store_chunk(job_id, 0, [{"id": 1, "name": "a"}], OutputFormat.PARQUET),
+        disk_handler.store_chunk(job_id, 1, [{"id": 2, "email": "b@x.com"}], OutputFormat.PARQUET),
+    ]
+
+    output_path = disk_handler.merge_chunks(
+        job_id, chunks, tmp_path / "out.parquet", OutputFormat.PARQUET
+    )
+
+    assert pq.read_table(output_path).to_pylist() == [
+        {"id": 1, "name": "a", "email": None},
+        {"id": 2, "name": None, "email": "b@x.com"},
+    ]
+
+
+
+def test_json_merge_matches_dumping_all_rows(disk_handler, tmp_path):
+    """Test that spliced JSON chunks are byte-identical to one dump of every row."""
+    job_id = uuid4()
+    batches = [[{"id": 1, "tags": ["a"]}, {"id": 2, "tags": []}], [], [{"id": 3, "tags": None}]]
+    chunks = [
+        disk_handler.store_chunk(job_id, chunk_id, rows, OutputFormat.JSON)
+        for chunk_id, rows in enumerate(batches)
+    ]
+
+    output_path = disk_handler.merge_chunks(
+        job_id, chunks, tmp_path / "out.json", OutputFormat.JSON
+    )
+
+    all_rows = [row for rows in batches for row in rows]
+    assert output_path.read_bytes() == orjson.dumps(all_rows, option=orjson.OPT_INDENT_2)
+
+
+@pytest.mark.parametrize("use_sendfile", [True, False])
+def test_csv_merge_keeps_one_header(disk_handler, tmp_path, monkeypatch, use_sendfile):
+    """Test that CSV merges copy every chunk's rows under a single header."""
+    monkeypatch.setattr(handlers, "_USE_SENDFILE", use_sendfile and handlers._USE_SENDFILE)
+    job_id = uuid4()
+    chunks = [
+        disk_handler.store_chunk(job_id, chunk_id, [row], OutputFormat.CSV)
+        for chunk_id, row in enumerate(TRICKY_ROWS)
+    ]
+
+    output_path = disk_handler.merge_chunks(job_id, chunks, tmp_path / "out.csv", OutputFormat.CSV)
+
+    with open(output_path, encoding="utf-8", newline="") as f:
+        assert list(csv.DictReader(f)) == TRICKY_ROWS
+
+
+def test_csv_merge_falls_back_when_sendfile_fails(disk_handler, tmp_path, monkeypatch):
+    """Test that a failing sendfile falls back to a user-space copy of the same bytes."""
+    def failing_sendfile(*args):
+        raise OSError("sendfile not supported")
+
+    monkeypatch.setattr(handlers, "_USE_SENDFILE", True)
+    monkeypatch.setattr(os, "sendfile", failing_sendfile, raising=False)
+    job_id = uuid4()
+    chunks = [
+        disk_handler.store_chunk(job_id, chunk_id, [row], OutputFormat.CSV)
+        for chunk_id, row in enumerate(TRICKY_ROWS)
+    ]
+
+    output_path = disk_handler.merge_chunks(job_id, chunks, tmp_path / "out.csv", OutputFormat.CSV)
+
+    with open(output_path, encoding="utf-8", newline="") as f:
+        assert list(csv.DictReader(f)) == TRICKY_ROWS
+
+
+@pytest.mark.parametrize("format", list(OutputFormat))
+def test_streamed_checksums_match_file_contents(disk_handler, tmp_path, format):
+    """Test that checksums hashed while writing equal a SHA-256 of the written file."""
+    job_id = uuid4()
+    chunks = [
+        disk_handler.store_chunk(job_id, chunk_id, [row], format)
+        for chunk_id, row in enumerate(TRICKY_ROWS)
+    ]
+    for chunk in chunks:
+        with open(chunk.storage_location, "rb") as f:
+            assert chunk.checksum == hashlib.sha256(f.read()).hexdigest()
+
+    digest = hashlib.sha256()
+    output_path = disk_handler.merge_chunks(
+        job_id, chunks, tmp_path / f"out.{format.value}", format, digest=digest
+    )
+
+    assert digest.hexdigest() == hashlib.sha256(output_path.read_bytes()).hexdigest()
+
+
+def test_csv_read_matches_dict_reader(disk_handler):
+    """Test that the Arrow CSV reader returns exactly what csv.DictReader would."""
+    metadata = disk_handler.store_chunk(uuid4(), 0, TRICKY_ROWS, OutputFormat.CSV)
+
+    with open(metadata.storage_location, encoding="utf-8", newline="") as f:
+        expected = list(csv.DictReader(f))
+
+    assert disk_handler.retrieve_chunk(metadata, OutputFormat.CSV) == expected == TRICKY_ROWS
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
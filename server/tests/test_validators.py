@@ -2,13 +2,13 @@
 
 import pytest
 
-from src.core.models import FieldConstraint, FieldDefinition, FieldType
-from src.utils.validators import validate_field_value
+from src.core.models import DataSchema, FieldConstraint, FieldDefinition, FieldType
+from src.utils.validators import validate_field_value, validate_row
 
 
-def test_string_validation():
-    """Test string field validation."""
-    field = FieldDefinition(
+@pytest.fixture(scope="module")
+def string_field():
+    return FieldDefinition(
         name="username",
         type=FieldType.STRING,
         constraints=FieldConstraint(
@@ -17,23 +17,10 @@ def test_string_validation():
         )
     )
 
-    # Valid
-    is_valid, error = validate_field_value("john_doe", field)
-    assert is_valid is True
-    assert error is None
-
-    # Too short
-    is_valid, error = validate_field_value("ab", field)
-    assert is_valid is False
 
-    # Too long
-    is_valid, error = validate_field_value("a" * 30, field)
-    assert is_valid is False
-
-
-def test_integer_validation():
-    """Test integer field validation."""
-    field = FieldDefinition(
+@pytest.fixture(scope="module")
+def integer_field():
+    return FieldDefinition(
         name="age",
         type=FieldType.INTEGER,
         constraints=FieldConstraint(
@@ -42,17 +29,39 @@ def test_integer_validation():
         )
     )
 
-    # Valid
-    is_valid, error = validate_field_value(25, field)
-    assert is_valid is True
 
-    # Too small
-    is_valid, error = validate_field_value(10, field)
-    assert is_valid is False
+@pytest.fixture(scope="module")
+def enum_field():
+    return FieldDefinition(
+        name="status",
+        type=FieldType.ENUM,
+        constraints=FieldConstraint(
+            enum_values=["active", "inactive", "pending"]
+        )
+    )
 
-    # Too large
-    is_valid, error = validate_field_value(150, field)
-    assert is_valid is False
+
+@pytest.mark.parametrize("value,ok", [
+    ("john_doe", True),  # Valid
+    ("ab", False),  # Too short
+    ("a" * 30, False),  # Too long
+])
+def test_string_validation(string_field, value, ok):
+    """Test string field validation."""
+    is_valid, error = validate_field_value(value, string_field)
+    assert is_valid is ok
+    assert (error is None) is ok
+
+
+@pytest.mark.parametrize("value,ok", [
+    (25, True),  # Valid
+    (10, False),  # Too small
+    (150, False),  # Too large
+])
+def test_integer_validation(integer_field, value, ok):
+    """Test integer field validation."""
+    is_valid, error = validate_field_value(value, integer_field)
+    assert is_valid is ok
 
 
 def test_email_validation():
@@ -71,23 +80,14 @@ def test_email_validation():
     assert is_valid is False
 
 
-def test_enum_validation():
+@pytest.mark.parametrize("value,ok", [
+    ("active", True),  # Valid
+    ("invalid", False),  # Invalid
+])
+def test_enum_validation(enum_field, value, ok):
     """Test enum field validation."""
-    field = FieldDefinition(
-        name="status",
-        type=FieldType.ENUM,
-        constraints=FieldConstraint(
-            enum_values=["active", "inactive", "pending"]
-        )
-    )
-
-    # Valid
-    is_valid, error = validate_field_value("active", field)
-    assert is_valid is True
-
-    # Invalid
-    is_valid, error = validate_field_value("invalid", field)
-    assert is_valid is False
+    is_valid, error = validate_field_value(value, enum_field)
+    assert is_valid is ok
 
 
 def test_nullable_validation():
@@ -108,5 +108,32 @@ def test_nullable_validation():
     assert is_valid is False
 
 
+def test_row_validation():
+    """Test validating a row across field types."""
+    schema = DataSchema(fields=[
+        FieldDefinition(name="id", type=FieldType.UUID),
+        FieldDefinition(name="phone", type=FieldType.PHONE),
+        FieldDefinition(name="active", type=FieldType.BOOLEAN),
+        FieldDefinition(
+            name="code",
+            type=FieldType.STRING,
+            constraints=FieldConstraint(pattern=r"^[A-Z]{3}$")
+        ),
+    ])
+
+    row = {
+        "id": "123e4567-e89b-12d3-a456-426614174000",
+        "phone": "+1 (555) 123-4567",
+        "active": "yes",
+        "code": "ABC",
+    }
+    assert validate_row(row, schema) == []
+
+    row = {"id": "not-a-uuid", "phone": "12345", "active": True, "code": "abc"}
+    errors = validate_row(row, schema)
+    assert len(errors) == 3
+    assert errors[0].startswith("id:")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])